@@ -85,11 +85,10 @@ def compute_simhash(text, hash_bits=64):
     vector = [0] * hash_bits
     for shingle in shingles:
         shingle_hash = hash(shingle) & ((1 << hash_bits) - 1)
+        # Branchless +1/-1 update: each bit maps to {+1,-1} via 2*bit - 1,
+        # so the unpredictable per-bit branch disappears
         for i in range(hash_bits):
-            if shingle_hash & (1 << i):
-                vector[i] += 1
-            else:
-                vector[i] -= 1
+            vector[i] += (((shingle_hash >> i) & 1) << 1) - 1
     
     fingerprint = 0
     for i in range(hash_bits):
@@ -99,7 +98,7 @@ def compute_simhash(text, hash_bits=64):
     return fingerprint
 
 def hamming_distance(hash1, hash2):
-    return bin(hash1 ^ hash2).count('1')
+    return (hash1 ^ hash2).bit_count()
 
 def is_duplicate(text_content, url):
     global duplicates_found
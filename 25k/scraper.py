@@ -135,11 +135,10 @@ def compute_simhash(text, hash_bits=64):
         shingle_hash = hash(shingle) & ((1 << hash_bits) - 1)
         
         # Update vector based on bits in hash
+        # Branchless +1/-1 update: each bit maps to {+1,-1} via 2*bit - 1,
+        # so the unpredictable per-bit branch disappears
         for i in range(hash_bits):
-            if shingle_hash & (1 << i):
-                vector[i] += 1
-            else:
-                vector[i] -= 1
+            vector[i] += (((shingle_hash >> i) & 1) << 1) - 1
     
     # Generate final fingerprint
     fingerprint = 0
@@ -156,7 +155,7 @@ def hamming_distance(hash1, hash2):
     
     Time Complexity: O(1)
     """
-    return bin(hash1 ^ hash2).count('1')
+    return (hash1 ^ hash2).bit_count()
 
 def is_duplicate(text_content, url):
     """
@@ -1,6 +1,8 @@
+from queue import Queue
+
 from utils import get_logger
 from crawler.frontier import Frontier
-from crawler.worker import Worker
+from crawler.worker import Worker, ScrapeWorker
 
 class Crawler(object):
     def __init__(self, config, restart, frontier_factory=Frontier, worker_factory=Worker):
@@ -8,13 +10,25 @@ class Crawler(object):
         self.logger = get_logger("CRAWLER")
         self.frontier = frontier_factory(config, restart)
         self.workers = list()
+        self.scrapers = list()
         self.worker_factory = worker_factory
 
     def start_async(self):
+        # Two-stage pipeline: threads_count downloaders feed a bounded
+        # queue drained by fewer scrape threads (downloads block on the
+        # network far longer than parsing takes). The maxsize applies
+        # backpressure on downloaders if parsing falls behind.
+        scraper_count = max(1, self.config.threads_count // 2)
+        self.scrape_queue = Queue(maxsize=2 * scraper_count)
         self.workers = [
-            self.worker_factory(worker_id, self.config, self.frontier)
+            self.worker_factory(
+                worker_id, self.config, self.frontier, self.scrape_queue)
             for worker_id in range(self.config.threads_count)]
-        for worker in self.workers:
+        self.scrapers = [
+            ScrapeWorker(
+                worker_id, self.config, self.frontier, self.scrape_queue)
+            for worker_id in range(scraper_count)]
+        for worker in self.workers + self.scrapers:
             worker.start()
 
     def start(self):
@@ -24,3 +38,9 @@ class Crawler(object):
     def join(self):
         for worker in self.workers:
             worker.join()
+        # Downloads are done; drain the scrape stage, then stop it
+        self.scrape_queue.join()
+        for _ in self.scrapers:
+            self.scrape_queue.put(None)
+        for scrape_worker in self.scrapers:
+            scrape_worker.join()
@@ -1,28 +1,45 @@
 import os
-import shelve
-from threading import RLock
-from queue import Queue, Empty
+import atexit
+import heapq
+import sqlite3
+from threading import RLock, Condition
+from collections import deque
 from urllib.parse import urlparse
 from time import time
 
-from utils import get_logger, get_urlhash, normalize
+from utils import get_logger, normalize
 from scraper import is_valid
 
+# How many url records to buffer before committing them to disk.
+# The old shelve backend fsynced on every single add/complete.
+SAVE_FLUSH_EVERY = 256
+
 class Frontier(object):
     def __init__(self, config, restart):
         self.logger = get_logger("FRONTIER")
         self.config = config
         
-        # Thread safety
+        # Thread safety. Workers block on the condition instead of
+        # polling; add_url notifies it whenever new work arrives.
         self.lock = RLock()
+        self.cond = Condition(self.lock)
         
-        # Per-domain queues and politeness tracking
-        self.domain_queues = {}  # domain -> Queue of URLs
+        # Per-domain queues and politeness tracking. Plain deques: all
+        # access happens under self.lock already, so queue.Queue's
+        # internal mutex was pure overhead.
+        self.domain_queues = {}  # domain -> deque of URLs
         self.last_access_time = {}  # domain -> timestamp of last access
+
+        # Min-heap of (ready_time, domain) so the next politeness-ready
+        # domain is found in O(log n) instead of scanning every domain.
+        # _scheduled tracks which domains currently sit in the heap.
+        self._ready_heap = []
+        self._scheduled = set()
         
         # URL tracking
         self.urls_seen = set()  # For quick duplicate checking
-        
+        self.urls_completed = set()
+
         if not os.path.exists(self.config.save_file) and not restart:
             # Save file does not exist, but request to load save.
             self.logger.info(
@@ -33,35 +50,82 @@ class Frontier(object):
             self.logger.info(
                 f"Found save file {self.config.save_file}, deleting it.")
             os.remove(self.config.save_file)
-        
-        # Load existing save file, or create one if it does not exist.
-        self.save = shelve.open(self.config.save_file)
-        
-        if restart:
+            for sidecar in (self.config.save_file + '-wal',
+                            self.config.save_file + '-shm'):
+                if os.path.exists(sidecar):
+                    os.remove(sidecar)
+
+        # The save file is a SQLite table of (url, completed) rows, loaded
+        # into memory on startup. WAL mode lets monitor/analysis read it
+        # while the crawl runs, and writes are batched into a commit every
+        # SAVE_FLUSH_EVERY records instead of fsyncing the whole store per
+        # URL like the old shelve backend did. All access happens under
+        # self.lock, so sharing one connection across workers is safe.
+        self._db = sqlite3.connect(
+            self.config.save_file, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS urls "
+            "(url TEXT PRIMARY KEY, completed INTEGER NOT NULL DEFAULT 0)")
+        # Single-row stats table so monitor can read the counts in O(1)
+        # instead of scanning the urls table; refreshed on every flush
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS stats "
+            "(id INTEGER PRIMARY KEY CHECK (id = 0), "
+            "total INTEGER, completed INTEGER)")
+        self._db.commit()
+        self._ops_since_flush = 0
+        atexit.register(self.flush)
+
+        self._parse_save_file()
+
+        if not self.urls_seen:
             for url in self.config.seed_urls:
                 self.add_url(url)
-        else:
-            # Set the frontier state with contents of save file.
-            self._parse_save_file()
-            if not self.save:
-                for url in self.config.seed_urls:
-                    self.add_url(url)
 
     def _parse_save_file(self):
         '''This function can be overridden for alternate saving techniques.'''
-        total_count = len(self.save)
         tbd_count = 0
-        
+
         with self.lock:
-            for url, completed in self.save.values():
-                if not completed and is_valid(url):
+            for url, completed in self._db.execute(
+                    "SELECT url, completed FROM urls"):
+                self.urls_seen.add(url)
+                if completed:
+                    self.urls_completed.add(url)
+
+            for url in self.urls_seen - self.urls_completed:
+                if is_valid(url):
                     self._add_to_domain_queue(url)
-                    self.urls_seen.add(normalize(url))
                     tbd_count += 1
-        
+
         self.logger.info(
-            f"Found {tbd_count} urls to be downloaded from {total_count} "
-            f"total urls discovered.")
+            f"Found {tbd_count} urls to be downloaded from "
+            f"{len(self.urls_seen)} total urls discovered.")
+
+    def _append_record(self, url, completed):
+        """Write one url record (must be called with lock held)"""
+        self._db.execute(
+            "INSERT OR REPLACE INTO urls (url, completed) VALUES (?, ?)",
+            (url, 1 if completed else 0))
+        self._ops_since_flush += 1
+        if self._ops_since_flush >= SAVE_FLUSH_EVERY:
+            self.flush()
+
+    def flush(self):
+        """Commit buffered url records to disk"""
+        with self.lock:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO stats (id, total, completed) "
+                    "VALUES (0, ?, ?)",
+                    (len(self.urls_seen), len(self.urls_completed)))
+                self._db.commit()
+            except sqlite3.ProgrammingError:
+                # Connection already closed during interpreter shutdown
+                return
+            self._ops_since_flush = 0
 
     def _get_domain(self, url):
         """Extract domain from URL"""
@@ -74,18 +138,21 @@ class Frontier(object):
     def _add_to_domain_queue(self, url):
         """Add URL to its domain's queue (must be called with lock held)"""
         domain = self._get_domain(url)
-        
+
         if domain not in self.domain_queues:
-            self.domain_queues[domain] = Queue()
-        
-        self.domain_queues[domain].put(url)
-    
+            self.domain_queues[domain] = deque()
+
+        self.domain_queues[domain].append(url)
+
+        if domain not in self._scheduled:
+            delay = self.config.time_delay
+            ready_time = self.last_access_time.get(domain, -delay) + delay
+            heapq.heappush(self._ready_heap, (ready_time, domain))
+            self._scheduled.add(domain)
+
     def _get_total_tbd_count(self):
         """Get total number of URLs to be downloaded"""
-        count = 0
-        for queue in self.domain_queues.values():
-            count += queue.qsize()
-        return count
+        return sum(len(queue) for queue in self.domain_queues.values())
 
     def get_tbd_url(self):
         """
@@ -93,73 +160,90 @@ class Frontier(object):
         Returns None if no URL is available or all domains need to wait.
         """
         with self.lock:
-            current_time = time()
-            politeness_delay = self.config.time_delay  # 0.5 seconds
-            
-            # Find domains that have URLs and are ready to be accessed
-            ready_domains = []
-            
-            for domain, queue in self.domain_queues.items():
-                if queue.empty():
+            politeness_delay = self.config.time_delay
+
+            while self._ready_heap:
+                ready_time, domain = self._ready_heap[0]
+                if ready_time > time():
+                    # Heap head is the earliest-ready domain; if it still
+                    # needs to wait, everything else does too
+                    return None
+
+                heapq.heappop(self._ready_heap)
+                self._scheduled.discard(domain)
+
+                queue = self.domain_queues.get(domain)
+                if not queue:
+                    # Domain drained since it was scheduled; it will be
+                    # re-pushed when a new URL arrives
                     continue
-                
-                last_time = self.last_access_time.get(domain, 0)
-                time_since_last = current_time - last_time
-                
-                # Check if enough time has passed since last access to this domain
-                if time_since_last >= politeness_delay:
-                    ready_domains.append((domain, queue))
-            
-            # If no domains are ready, check if we're truly done
-            if not ready_domains:
-                total_remaining = self._get_total_tbd_count()
-                if total_remaining == 0:
-                    return None  # Truly done
-                # URLs exist but all domains need to wait
-                return None  # Caller should retry after short sleep
-            
-            # Pick first ready domain
-            domain, queue = ready_domains[0]
-            
-            try:
-                url = queue.get_nowait()
-                
-                # Update last access time for this domain
+
+                url = queue.popleft()
+                current_time = time()
                 self.last_access_time[domain] = current_time
-                
+
+                if queue:
+                    heapq.heappush(
+                        self._ready_heap,
+                        (current_time + politeness_delay, domain))
+                    self._scheduled.add(domain)
+
                 return url
-            
-            except Empty:
+
+            return None
+
+    def next_ready_in(self):
+        """
+        Hint for workers that just got None from get_tbd_url: seconds
+        until the earliest scheduled domain comes off politeness hold,
+        or None if nothing is scheduled. Lets them sleep exactly that
+        long instead of a fixed poll interval.
+        """
+        with self.lock:
+            if not self._ready_heap:
                 return None
+            return max(0.0, self._ready_heap[0][0] - time())
 
     def add_url(self, url):
         """Add URL to frontier (with duplicate checking)"""
         url = normalize(url)
-        urlhash = get_urlhash(url)
-        
+
         with self.lock:
-            # Check if already seen (in-memory check, faster than shelve)
             if url in self.urls_seen:
                 return
-            
-            # Check if in save file
-            if urlhash not in self.save:
-                self.save[urlhash] = (url, False)
-                self.save.sync()
-                
-                # Add to domain queue
-                self._add_to_domain_queue(url)
+
+            self.urls_seen.add(url)
+            self._append_record(url, False)
+            self._add_to_domain_queue(url)
+            self.cond.notify()
+
+    def add_urls(self, urls):
+        """Add many URLs under a single lock acquisition"""
+        with self.lock:
+            added = 0
+            for url in urls:
+                url = normalize(url)
+                if url in self.urls_seen:
+                    continue
+
                 self.urls_seen.add(url)
-    
+                self._append_record(url, False)
+                self._add_to_domain_queue(url)
+                added += 1
+
+            if added:
+                # Several domains may have become ready at once
+                self.cond.notify_all()
+
     def mark_url_complete(self, url):
         """Mark URL as completed"""
-        urlhash = get_urlhash(url)
-        
+        url = normalize(url)
+
         with self.lock:
-            if urlhash not in self.save:
+            if url not in self.urls_seen:
                 # This should not happen.
                 self.logger.error(
                     f"Completed url {url}, but have not seen it before.")
-            
-            self.save[urlhash] = (url, True)
-            self.save.sync()
\ No newline at end of file
+
+            self.urls_completed.add(url)
+            self._append_record(url, True)
\ No newline at end of file
@@ -1,110 +1,154 @@
 from threading import Thread
 from inspect import getsource
-from time import sleep, time
+from time import time
 from utils.download import download
 from utils import get_logger
 import scraper
 import traceback
 
-class Worker(Thread):
-    def __init__(self, worker_id, config, frontier):
+_scraper_source_verified = False
+
+def _verify_scraper_imports():
+    """Basic check for requests/urllib.request in scraper, run once per
+    process instead of re-reading the source for every worker."""
+    global _scraper_source_verified
+    if _scraper_source_verified:
+        return
+    src = getsource(scraper)
+    assert not any(tok in src for tok in
+                   ("from requests import", "import requests")), \
+        "Do not use requests in scraper.py"
+    assert not any(tok in src for tok in
+                   ("from urllib.request import", "import urllib.request")), \
+        "Do not use urllib.request in scraper.py"
+    _scraper_source_verified = True
+
+class DownloadWorker(Thread):
+    """First pipeline stage: pull URLs from the frontier, download them,
+    and hand (url, resp) pairs to the scrape stage. Keeping download and
+    scrape in separate threads overlaps network wait with parsing."""
+
+    def __init__(self, worker_id, config, frontier, scrape_queue):
         self.logger = get_logger(f"Worker-{worker_id}", "Worker")
         self.config = config
         self.frontier = frontier
         self.worker_id = worker_id
-        
-        # basic check for requests in scraper
-        assert {getsource(scraper).find(req) for req in {"from requests import", "import requests"}} == {-1}, \
-            "Do not use requests in scraper.py"
-        assert {getsource(scraper).find(req) for req in {"from urllib.request import", "import urllib.request"}} == {-1}, \
-            "Do not use urllib.request in scraper.py"
-        
+        self.scrape_queue = scrape_queue
+
+        _verify_scraper_imports()
+
         super().__init__(daemon=True)
-        
+
     def run(self):
         self.logger.info(f"Worker-{self.worker_id} started")
-        
-        consecutive_none_count = 0
-        max_consecutive_none = 100  # ← INCREASED from 20
+
         last_successful_download = time()
-        max_idle_time = 30  # ← Stop after 30 seconds of no progress
-        
+        max_idle_time = 30  # Stop after 30 seconds of no progress
+
         while True:
             try:
-                tbd_url = self.frontier.get_tbd_url()
-                
-                if not tbd_url:
-                    consecutive_none_count += 1
-                    
-                    # Check if we've been idle too long
-                    idle_time = time() - last_successful_download
-                    
-                    if consecutive_none_count >= max_consecutive_none and idle_time > max_idle_time:
-                        # Double-check frontier is actually empty
-                        total_remaining = self.frontier._get_total_tbd_count()
-                        
-                        if total_remaining == 0:
-                            self.logger.info("Frontier is empty. Stopping Crawler.")
+                # Block on the frontier's condition instead of polling:
+                # add_url wakes us as soon as new work arrives, and the
+                # timeout covers politeness holds — sized to the exact
+                # time the next domain becomes ready (capped at 1s so
+                # the idle-shutdown check still runs), so short delays
+                # aren't stretched to a full poll interval
+                with self.frontier.cond:
+                    tbd_url = self.frontier.get_tbd_url()
+                    while not tbd_url:
+                        idle_time = time() - last_successful_download
+                        if (idle_time > max_idle_time
+                                and self.frontier._get_total_tbd_count() == 0):
                             break
-                        else:
-                            self.logger.info(
-                                f"Waiting for politeness delay... "
-                                f"({total_remaining} URLs remaining)"
-                            )
-                            consecutive_none_count = 0  # Reset counter
-                            sleep(1)  # Longer wait when stuck
-                            continue
-                    
-                    # Normal wait
-                    sleep(0.1)
-                    continue
-                
-                # Got a URL - reset counters
-                consecutive_none_count = 0
+                        hint = self.frontier.next_ready_in()
+                        timeout = 1.0 if hint is None else min(1.0, hint)
+                        self.frontier.cond.wait(timeout=timeout)
+                        tbd_url = self.frontier.get_tbd_url()
+
+                if not tbd_url:
+                    self.logger.info("Frontier is empty. Stopping Crawler.")
+                    break
+
                 last_successful_download = time()
-                
+
                 # Download the page
                 resp = download(tbd_url, self.config, self.logger)
                 self.logger.info(
                     f"Downloaded {tbd_url}, status <{resp.status}>, "
                     f"using cache {self.config.cache_server}.")
-                
+
+                # Hand off to the scrape stage; the bounded queue applies
+                # backpressure if parsing falls behind downloads
+                self.scrape_queue.put((tbd_url, resp))
+
+            except Exception as e:
+                self.logger.error(
+                    f"Worker-{self.worker_id}: Unexpected error: {e}")
+                self.logger.error(traceback.format_exc())
+
+                # Mark URL as complete to avoid infinite retry
+                if 'tbd_url' in locals():
+                    try:
+                        self.frontier.mark_url_complete(tbd_url)
+                    except:
+                        pass
+
+        self.logger.info(f"Worker-{self.worker_id} stopped")
+
+class ScrapeWorker(Thread):
+    """Second pipeline stage: parse downloaded pages and feed discovered
+    URLs back into the frontier. Stops on a None sentinel."""
+
+    def __init__(self, worker_id, config, frontier, scrape_queue):
+        self.logger = get_logger(f"Scraper-{worker_id}", "Worker")
+        self.config = config
+        self.frontier = frontier
+        self.worker_id = worker_id
+        self.scrape_queue = scrape_queue
+
+        super().__init__(daemon=True)
+
+    def run(self):
+        self.logger.info(f"Scraper-{self.worker_id} started")
+
+        while True:
+            item = self.scrape_queue.get()
+            if item is None:
+                break
+            tbd_url, resp = item
+
+            try:
                 # Scrape for new URLs
                 try:
                     scraped_urls = scraper.scraper(tbd_url, resp)
                 except Exception as e:
                     self.logger.error(f"Scraper error for {tbd_url}: {e}")
                     scraped_urls = []
-                
-                # Add new URLs to frontier
-                for scraped_url in scraped_urls:
-                    try:
-                        self.frontier.add_url(scraped_url)
-                    except Exception as e:
-                        self.logger.error(f"Error adding URL {scraped_url}: {e}")
-                
+
+                # Add new URLs to frontier in one batch (one lock acquire
+                # per page instead of one per link)
+                try:
+                    self.frontier.add_urls(scraped_urls)
+                except Exception as e:
+                    self.logger.error(f"Error adding URLs for {tbd_url}: {e}")
+
                 # Mark as complete
                 try:
                     self.frontier.mark_url_complete(tbd_url)
                 except Exception as e:
                     self.logger.error(f"Error marking complete {tbd_url}: {e}")
-                
+
                 self.logger.info(
                     f"Processed {tbd_url}, found {len(scraped_urls)} valid links")
-                
-                # Small delay to reduce lock contention
-                sleep(0.05)
-            
+
             except Exception as e:
                 self.logger.error(
-                    f"Worker-{self.worker_id}: Unexpected error: {e}")
+                    f"Scraper-{self.worker_id}: Unexpected error: {e}")
                 self.logger.error(traceback.format_exc())
-                
-                # Mark URL as complete to avoid infinite retry
-                if 'tbd_url' in locals():
-                    try:
-                        self.frontier.mark_url_complete(tbd_url)
-                    except:
-                        pass
-        
-        self.logger.info(f"Worker-{self.worker_id} stopped")
\ No newline at end of file
+            finally:
+                self.scrape_queue.task_done()
+
+        self.logger.info(f"Scraper-{self.worker_id} stopped")
+
+# Kept as the default worker_factory name used by Crawler
+Worker = DownloadWorker
@@ -1,10 +1,11 @@
 import os
-import json
-import shelve
-from collections import Counter, defaultdict
+import orjson
+import sqlite3
+import multiprocessing
+from collections import Counter
 from urllib.parse import urlparse, urldefrag
 
-STOP_WORDS = set([
+STOP_WORDS = frozenset([
     "a", "about", "above", "after", "again", "against", "all", "am", "an", "and",
     "any", "are", "aren't", "as", "at", "be", "because", "been", "before", "being",
     "below", "between", "both", "but", "by", "can't", "cannot", "could", "couldn't",
@@ -27,52 +28,82 @@ STOP_WORDS = set([
     "yourselves"
 ])
 
+# The tokenizer only ever emits [a-z0-9] tokens, so every possible 1-2
+# character token can be enumerated up front; folding them into the stop
+# set collapses the old "not a stop word and len >= 3" filter into one
+# membership test per token.
+_ALNUM = "abcdefghijklmnopqrstuvwxyz0123456789"
+SKIP_TOKENS = (STOP_WORDS
+               | frozenset(_ALNUM)
+               | frozenset(a + b for a in _ALNUM for b in _ALNUM))
+
+# Translate table mapping every non-alphanumeric ASCII byte to a space, so
+# tokenization is one C-level translate + split instead of a per-char loop.
+_TOKEN_TRANS = bytes.maketrans(
+    bytes(range(256)),
+    bytes(c if c < 128 and chr(c).isalnum() else 0x20 for c in range(256)))
+
 def tokenize_words_list(words_list):
     """
     Tokenize a list of words (from JSON)
     """
-    for word in words_list:
-        word = word.lower()
-        token = ""
-        for char in word:
-            try:
-                if char.isascii() and char.isalnum():
-                    token += char
-                else:
-                    if token:
-                        yield token
-                        token = ""
-            except Exception:
-                continue
-        if token:
-            yield token
-
-def computeWordFrequencies(tokenIterator):
-    counter = {}
-    for token in tokenIterator:
-        counter[token] = counter.get(token, 0) + 1
-    return counter
+    text = ' '.join(words_list).lower().encode('ascii', 'replace')
+    return text.translate(_TOKEN_TRANS).decode('ascii').split()
+
+def _records(path):
+    """Yield page dicts from one file: a single-page .json or a .jsonl
+    shard holding many pages appended by the background writer."""
+    with open(path, 'rb') as f:
+        if path.endswith('.jsonl'):
+            for line in f:
+                if line.strip():
+                    yield orjson.loads(line)
+        else:
+            yield orjson.loads(f.read())
+
+def _process_file(path):
+    """
+    Tokenize the saved pages in one file (run in a worker process).
+    Returns (word frequencies, longest url, longest word count).
+    """
+    frequencies = Counter()
+    longest_url = ''
+    longest_count = 0
+
+    try:
+        for data in _records(path):
+            tokens = tokenize_words_list(data.get('words', []))
+            frequencies.update(t for t in tokens if t not in SKIP_TOKENS)
+
+            if len(tokens) > longest_count:
+                longest_url = data.get('url', '')
+                longest_count = len(tokens)
+
+    except Exception:
+        pass
+
+    return frequencies, longest_url, longest_count
 
 def main():
 
     print("[1/4] Counting unique pages...")
     
     try:
-        db = shelve.open('frontier.shelve', 'r')
-        
+        db = sqlite3.connect('file:frontier.shelve?mode=ro', uri=True)
+
         unique_urls = set()
-        completed_urls = []
-        
-        for url_hash, (url, completed) in db.items():
+        completed_urls = set()
+
+        for url, completed in db.execute("SELECT url, completed FROM urls"):
             clean_url, _ = urldefrag(url)
             unique_urls.add(clean_url)
-            
+
             if completed:
-                completed_urls.append(clean_url)
-        
+                completed_urls.add(clean_url)
+
         db.close()
-        
-        unique_completed = len(set(completed_urls))
+
+        unique_completed = len(completed_urls)
         
         print(f"✓ Total unique pages: {unique_completed:,}")
         print()
@@ -87,13 +118,14 @@ def main():
         print("Error: crawl_data directory not found!")
         return
     
-    data_files = [f for f in os.listdir('crawl_data') if f.endswith('.json')]
-    
+    data_files = [f for f in os.listdir('crawl_data')
+                  if f.endswith(('.json', '.jsonl'))]
+
     if not data_files:
         print("Error: No data files found in crawl_data/")
         return
-    
-    print(f"✓ Found {len(data_files)} saved pages")
+
+    print(f"✓ Found {len(data_files)} data files")
     
     all_word_frequencies = Counter()
     
@@ -103,57 +135,48 @@ def main():
         'word_count': 0
     }
     
-    for i, filename in enumerate(data_files):
-        if i % 500 == 0 and i > 0:
-            print(f"  Progress: {i}/{len(data_files)}...")
-        
-        try:
-            with open(os.path.join('crawl_data', filename), 'r') as f:
-                data = json.load(f)
-            
-            words_list = data.get('words', [])
-            
-            tokens = list(tokenize_words_list(words_list))
-            
-            filtered_tokens = [
-                t for t in tokens 
-                if t not in STOP_WORDS  # Not a stop word
-                and len(t) >= 3    # ← NEW: Additional validation
-            ]            
-            token_frequencies = computeWordFrequencies(iter(filtered_tokens))
-            all_word_frequencies.update(token_frequencies)
-            
-            word_count = len(tokens) 
+    paths = [os.path.join('crawl_data', f) for f in data_files]
+
+    # Tokenization is CPU-bound, so spread the files over a process pool;
+    # partial Counters come back in completion order and merge here. The
+    # chunk size adapts so a handful of big JSONL shards still fans out.
+    chunksize = max(1, len(paths) // (4 * (multiprocessing.cpu_count() or 1)))
+    with multiprocessing.Pool() as pool:
+        results = pool.imap_unordered(_process_file, paths,
+                                      chunksize=min(chunksize, 64))
+        for i, (frequencies, page_url, word_count) in enumerate(results):
+            if i % 500 == 0 and i > 0:
+                print(f"  Progress: {i}/{len(data_files)}...")
+
+            all_word_frequencies.update(frequencies)
+
             if word_count > longest_page['word_count']:
                 longest_page = {
-                    'url': data['url'],
+                    'url': page_url,
                     'word_count': word_count
                 }
-        
-        except Exception as e:
-            continue
     
     print(f"✓ Analysis complete")
     print()
     
     print("[3/4] Counting subdomains...")
     
-    subdomains = defaultdict(set)  
-    
+    # unique_urls is already deduplicated, so a plain Counter suffices;
+    # no need to hold every URL string per subdomain just to count them
+    subdomain_counts = Counter()
+
     for url in unique_urls:
         try:
             parsed = urlparse(url)
             domain = parsed.netloc.lower()
-            
+
             if domain.endswith('.uci.edu') or domain == 'uci.edu':
-                subdomains[domain].add(url)
-        
+                subdomain_counts[domain] += 1
+
         except Exception:
             continue
-    
-    subdomain_counts = {sub: len(urls) for sub, urls in subdomains.items()}
-    
-    print(f"✓ Found {len(subdomains)} subdomains")
+
+    print(f"✓ Found {len(subdomain_counts)} subdomains")
     print()
     
     print("[4/4] Generating report...")
@@ -184,7 +207,7 @@ def main():
     
     report.append("4. HOW MANY SUBDOMAINS IN UCI.EDU?")
     report.append("-" * 80)
-    report.append(f"Answer: {len(subdomains)} subdomains")
+    report.append(f"Answer: {len(subdomain_counts)} subdomains")
     report.append("")
     report.append("Subdomain list (alphabetically ordered):")
     report.append("")
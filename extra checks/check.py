@@ -1,16 +1,16 @@
 #!/usr/bin/env python3
 """Check if seed domains were actually crawled"""
 
-import shelve
+import sqlite3
 from urllib.parse import urlparse
 from collections import defaultdict
 
-db = shelve.open('frontier.shelve', 'r')
+db = sqlite3.connect('file:frontier.shelve?mode=ro', uri=True)
 
 # Count by domain
 domain_counts = defaultdict(lambda: {'total': 0, 'completed': 0})
 
-for url_hash, (url, completed) in db.items():
+for url, completed in db.execute("SELECT url, completed FROM urls"):
     domain = urlparse(url).netloc.lower()
     domain_counts[domain]['total'] += 1
     if completed:
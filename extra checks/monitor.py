@@ -5,7 +5,7 @@ Enhanced log-based progress monitor with ETA estimation
 
 import os
 import time
-import shelve
+import sqlite3
 from datetime import datetime, timedelta
 from collections import deque
 
@@ -25,21 +25,21 @@ def format_time(seconds):
 def try_read_frontier():
     """Try to read frontier database with timeout"""
     try:
-        db = shelve.open('frontier.shelve', flag='r')
-        
-        total = 0
-        completed = 0
-        
-        # Quick count with timeout protection
-        for url_hash, (url, is_completed) in db.items():
-            total += 1
-            if is_completed:
-                completed += 1
-            
-            # Don't spend too long reading
-            if total > 10000 and total % 1000 == 0:
-                break
-        
+        db = sqlite3.connect('file:frontier.shelve?mode=ro', uri=True)
+
+        # The frontier keeps running totals in a single stats row; fall
+        # back to counting the urls table if it isn't there yet
+        try:
+            row = db.execute(
+                "SELECT total, completed FROM stats WHERE id = 0").fetchone()
+        except sqlite3.OperationalError:
+            row = None
+        if row is None:
+            row = db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(completed), 0) FROM urls"
+            ).fetchone()
+        total, completed = row
+
         pending = total - completed
         db.close()
         
@@ -119,32 +119,44 @@ def monitor():
     frontier_check_interval = 30  # Try to read frontier every 30 seconds
     last_frontier_check = 0
     frontier_data = {'accessible': False}
-    
+
+    # Tail the worker log incrementally: remember the last byte offset and
+    # only parse what was appended since the previous tick
+    last_pos = 0
+    downloads_count = 0
+    errors = 0
+    recent_downloads = deque(maxlen=5)
+
     while True:
         try:
-            
+
             current_time = time.time()
             elapsed = current_time - start_time
-            
-            # Parse logs
-            downloads = []
-            errors = 0
-            
+
+            # Parse new log lines since last tick
             if os.path.exists('Logs/Worker.log'):
-                with open('Logs/Worker.log', 'r') as f:
-                    for line in f:
-                        if 'Downloaded' in line:
-                            downloads.append(line)
-                        elif 'ERROR' in line:
-                            errors += 1
-            
+                with open('Logs/Worker.log', 'rb') as f:
+                    f.seek(0, os.SEEK_END)
+                    if f.tell() < last_pos:
+                        # Log was truncated/rotated; start over
+                        last_pos = 0
+                    f.seek(last_pos)
+                    chunk = f.read()
+                    last_pos = f.tell()
+
+                for line in chunk.splitlines():
+                    if b'Downloaded' in line:
+                        downloads_count += 1
+                        recent_downloads.append(
+                            line.decode('utf-8', errors='replace'))
+                    elif b'ERROR' in line:
+                        errors += 1
+
             # Count saved files
             saved = 0
             if os.path.exists('crawl_data'):
                 saved = len([f for f in os.listdir('crawl_data') if f.endswith('.json')])
             
-            downloads_count = len(downloads)
-            
             # Calculate instantaneous rate
             time_since_check = current_time - last_check
             if time_since_check >= 5:  # Update every 5 seconds
@@ -210,7 +222,7 @@ def monitor():
             # Recent activity
             print("📝 Last 5 Downloads:")
             print("-" * 80)
-            for line in downloads[-5:]:
+            for line in recent_downloads:
                 parts = line.split('Downloaded')
                 if len(parts) > 1:
                     url = parts[1].split(',')[0].strip()
@@ -1,8 +1,11 @@
 import re
-import hashlib
-from urllib.parse import urlparse, urljoin, urldefrag
-from bs4 import BeautifulSoup
+import xxhash
+import numpy as np
+from urllib.parse import urlparse, urljoin
+from lxml import etree, html as lxml_html
 from threading import Lock
+from collections import defaultdict
+from functools import lru_cache
 
 VALID_DOMAINS = (
     "ics.uci.edu",
@@ -11,84 +14,151 @@ VALID_DOMAINS = (
     "stat.uci.edu"
 )
 
-# Thread-safe storage for duplicate detection
-seen_exact_hashes = set()
-seen_simhashes = []  # List of (simhash, url) tuples
-content_lock = Lock()  # Lock for accessing duplicate detection data
+# File extensions that should never be crawled; an O(1) set probe on the
+# path's extension replaces the old alternation regex
+_BAD_EXTS = frozenset({
+    "css", "js", "bmp", "gif", "jpg", "jpeg", "ico",
+    "png", "tif", "tiff", "mid", "mp2", "mp3", "mp4",
+    "wav", "avi", "mov", "mpeg", "ram", "m4v", "mkv", "ogg", "ogv", "pdf",
+    "ps", "eps", "tex", "ppt", "pptx", "doc", "docx", "xls", "xlsx", "names",
+    "data", "dat", "exe", "bz2", "tar", "msi", "bin", "7z", "psd", "dmg",
+    "iso", "epub", "dll", "cnf", "tgz", "sha1",
+    "thmx", "mso", "arff", "rtf", "jar", "csv",
+    "rm", "smil", "wmv", "swf", "wma", "zip", "rar", "gz",
+})
+
+# Thread-safe storage for duplicate detection. The exact-hash set is
+# sharded across 16 locks so concurrent workers only contend when their
+# hashes land in the same shard, instead of serializing on one big lock.
+_SHARDS = 16
+_exact_locks = [Lock() for _ in range(_SHARDS)]
+_exact_shards = [set() for _ in range(_SHARDS)]
 SIMHASH_THRESHOLD = 10  # Hamming distance threshold for near-duplicates
+SIMHASH_WINDOW = 1000  # Only remember the most recent fingerprints
+
+# Fixed-size ring of (simhash, url); the slot being overwritten is also
+# evicted from the band index, so memory and lookup cost stay bounded
+# no matter how long the crawl runs
+seen_simhashes = [None] * SIMHASH_WINDOW
+_ring_pos = 0
+_ring_lock = Lock()
+
+def _hash_shard(content_hash):
+    """Pick the shard for a content-hash int"""
+    return content_hash & 0xF
+
+# Banded LSH index: split each 64-bit simhash into 4 bands of 16 bits and
+# bucket by band value. Two hashes within the threshold almost always agree
+# on at least one band, so only bucket-mates need a hamming check instead
+# of every stored fingerprint.
+SIMHASH_BANDS = 4
+SIMHASH_BAND_BITS = 16
+SIMHASH_BAND_MASK = (1 << SIMHASH_BAND_BITS) - 1
+
+simhash_bands = [defaultdict(list) for _ in range(SIMHASH_BANDS)]
+_band_locks = [Lock() for _ in range(SIMHASH_BANDS)]
+
+# Whitespace collapser for text extraction, compiled once at import
+_WS_RE = re.compile(r'\s+')
+
+def _simhash_band_keys(simhash):
+    """Yield (band, bucket key) pairs for a fingerprint"""
+    for band in range(SIMHASH_BANDS):
+        yield band, (simhash >> (SIMHASH_BAND_BITS * band)) & SIMHASH_BAND_MASK
 
 def scraper(url, resp):
     """Main scraper function called by workers"""
-    # Check for duplicate content first
-    if is_duplicate_content(url, resp):
-        return []
-    
-    # Extract and filter links
-    links = extract_next_links(url, resp)
-    return [link for link in links if is_valid(link)]
-
-def extract_next_links(url, resp):
-    """Extract all links from the HTML page"""
-    links = set()
-    
     try:
         # Check if response is valid
         if resp is None or resp.status != 200:
             return []
-        
+
         content = resp.raw_response.content
         if not content:
             return []
-        
-        # Parse HTML
-        soup = BeautifulSoup(content, "lxml")
-        
-        # Find all <a> tags with href attribute
-        for tag in soup.find_all("a", href=True):
-            href = tag.get("href")
-            
+    except Exception:
+        return []
+
+    # One parse serves both duplicate detection and link extraction
+    text_content, hrefs = parse_page(content)
+
+    # Check for duplicate content first
+    if is_duplicate_content(url, text_content):
+        return []
+
+    # Resolve and filter links
+    links = extract_next_links(url, hrefs)
+    return [link for link in links if is_valid(link)]
+
+def parse_page(content):
+    """Parse the HTML once, returning (visible text, raw href values)"""
+    try:
+        doc = lxml_html.fromstring(content)
+
+        # xpath pulls the href attributes out in C without wrapping every
+        # anchor in a Python tag object; collect them before the
+        # boilerplate containers (nav etc.) are stripped away
+        hrefs = doc.xpath('//a/@href')
+
+        # Remove non-content tags
+        etree.strip_elements(
+            doc, "script", "style", "meta", "link", "noscript",
+            "header", "footer", "nav", with_tail=False)
+
+        # Get text and normalize
+        text = _WS_RE.sub(' ', doc.text_content().lower())
+
+        return text.strip(), hrefs
+
+    except Exception:
+        return "", []
+
+def extract_next_links(url, hrefs):
+    """Resolve raw hrefs from the page against its URL"""
+    links = set()
+
+    try:
+        for href in hrefs:
             # Convert to absolute URL
             absolute_url = urljoin(url, href)
-            
-            # Remove URL fragments (#section)
-            clean_url, _ = urldefrag(absolute_url)
-            
+
+            # Remove URL fragments (#section); a plain split avoids the
+            # full parse urldefrag would do
+            clean_url = absolute_url.split('#', 1)[0]
+
             # Add to set (automatically handles duplicates)
             if clean_url:
                 links.add(clean_url)
-    
+
     except Exception as e:
         print(f"Error extracting links from {url}: {e}")
         return []
-    
+
     return list(links)
 
-def is_valid(url):
+@lru_cache(maxsize=8192)
+def _parse(url):
+    """Memoized urlparse; link extraction and validation hit the same URLs"""
+    return urlparse(url)
+
+def is_valid(url, parsed=None):
     """Check if URL should be crawled"""
     try:
-        parsed = urlparse(url)
-        
+        if parsed is None:
+            parsed = _parse(url)
+
         # Only http/https
         if parsed.scheme not in {"http", "https"}:
             return False
         
-        # Only valid UCI domains
+        # Only valid UCI domains (endswith takes the tuple directly)
         netloc = parsed.netloc.lower()
-        if not any(netloc.endswith(domain) for domain in VALID_DOMAINS):
+        if not netloc.endswith(VALID_DOMAINS):
             return False
-        
+
         # Filter out files by extension
-        if re.match(
-            r".*\.(css|js|bmp|gif|jpe?g|ico"
-            r"|png|tiff?|mid|mp2|mp3|mp4"
-            r"|wav|avi|mov|mpeg|ram|m4v|mkv|ogg|ogv|pdf"
-            r"|ps|eps|tex|ppt|pptx|doc|docx|xls|xlsx|names"
-            r"|data|dat|exe|bz2|tar|msi|bin|7z|psd|dmg|iso"
-            r"|epub|dll|cnf|tgz|sha1"
-            r"|thmx|mso|arff|rtf|jar|csv"
-            r"|rm|smil|wmv|swf|wma|zip|rar|gz)$",
-            parsed.path.lower()
-        ):
+        path = parsed.path.lower()
+        if '.' in path and path.rsplit('.', 1)[1] in _BAD_EXTS:
             return False
         
         # Filter out calendar pages
@@ -110,95 +180,88 @@ def is_valid(url):
 # DUPLICATE DETECTION (Thread-Safe)
 # ============================================================
 
-def is_duplicate_content(url, resp):
+def is_duplicate_content(url, text_content):
     """
     Thread-safe duplicate detection using exact hash and simhash.
+    Takes the text already extracted by parse_page.
     Returns True if duplicate (should skip), False if unique.
     """
     try:
-        content = resp.raw_response.content
-        if not content:
-            return True  # Empty content is duplicate
-        
-        # Extract and normalize text content
-        text_content = extract_text_content(content)
-        
         if not text_content or len(text_content.strip()) < 50:
             return True  # Too little content
-        
-        # Thread-safe duplicate checking
-        with content_lock:
-            # Check exact duplicate
-            content_hash = compute_hash(text_content)
-            if content_hash in seen_exact_hashes:
-                return True
-            
-            # Check near-duplicate using simhash
-            content_simhash = compute_simhash(text_content)
-            if is_near_duplicate(content_simhash):
+
+        # Hash outside any lock; only the shard the hash lands in is held,
+        # and only for the membership check + insert
+        content_hash = compute_hash(text_content)
+        shard = _hash_shard(content_hash)
+        with _exact_locks[shard]:
+            if content_hash in _exact_shards[shard]:
                 return True
-            
-            # Not a duplicate - store fingerprints
-            seen_exact_hashes.add(content_hash)
-            seen_simhashes.append((content_simhash, url))
-        
+            _exact_shards[shard].add(content_hash)
+
+        # Check near-duplicate using simhash
+        content_simhash = compute_simhash(text_content)
+        if is_near_duplicate(content_simhash):
+            return True
+
+        # Not a duplicate - store fingerprints, evicting whatever falls
+        # out of the window from the band index as well
+        global _ring_pos
+        with _ring_lock:
+            evicted = seen_simhashes[_ring_pos]
+            if evicted is not None:
+                old_simhash = evicted[0]
+                for band, key in _simhash_band_keys(old_simhash):
+                    with _band_locks[band]:
+                        bucket = simhash_bands[band].get(key)
+                        if bucket:
+                            try:
+                                bucket.remove(old_simhash)
+                            except ValueError:
+                                pass
+                            if not bucket:
+                                del simhash_bands[band][key]
+
+            seen_simhashes[_ring_pos] = (content_simhash, url)
+            _ring_pos = (_ring_pos + 1) % SIMHASH_WINDOW
+
+            for band, key in _simhash_band_keys(content_simhash):
+                with _band_locks[band]:
+                    simhash_bands[band][key].append(content_simhash)
+
         return False
     
     except Exception:
         return False  # If error, allow crawling
 
 
-def extract_text_content(html_content):
-    """Extract visible text from HTML"""
-    try:
-        soup = BeautifulSoup(html_content, "lxml")
-        
-        # Remove non-content tags
-        for tag in soup(["script", "style", "meta", "link", "noscript", "header", "footer", "nav"]):
-            tag.decompose()
-        
-        # Get text and normalize
-        text = soup.get_text(separator=' ', strip=True)
-        text = re.sub(r'\s+', ' ', text.lower())
-        
-        return text.strip()
-    
-    except Exception:
-        return ""
-
 
 def compute_hash(text):
-    """Compute MD5 hash for exact duplicate detection"""
-    return hashlib.md5(text.encode('utf-8', errors='ignore')).hexdigest()
+    """Compute a 128-bit xxh3 hash for exact duplicate detection"""
+    return xxhash.xxh3_128_intdigest(text.encode('utf-8', errors='ignore'))
 
 
 def compute_simhash(text, hash_bits=64):
     """Compute simhash fingerprint for near-duplicate detection"""
     tokens = create_shingles(text, n=3)
-    
+
     if not tokens:
         return 0
-    
-    # Initialize bit vector
-    vector = [0] * hash_bits
-    
-    # Process each token
-    for token in tokens:
-        token_hash = hash(token) & ((1 << hash_bits) - 1)
-        
-        for i in range(hash_bits):
-            if token_hash & (1 << i):
-                vector[i] += 1
-            else:
-                vector[i] -= 1
-    
-    # Create fingerprint
-    fingerprint = 0
-    for i in range(hash_bits):
-        if vector[i] > 0:
-            fingerprint |= (1 << i)
-    
-    return fingerprint
+
+    mask = (1 << hash_bits) - 1
+    hashes = np.fromiter((hash(t) & mask for t in tokens), dtype=np.uint64)
+
+    # Unpack every hash into a row of 64 bits, LSB in column 0 to match
+    # the old per-bit loop (unpackbits is MSB-first per byte, hence the
+    # byte reversal), then tally all rows in one C pass:
+    # column sum s gives vector[i] = 2*s - n
+    bits = np.unpackbits(
+        hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+    vector = 2 * bits.sum(axis=0, dtype=np.int64) - hashes.size
+
+    # Re-pack the sign bits into the fingerprint
+    return int(np.packbits(
+        (vector > 0).astype(np.uint8), bitorder='little').view('<u8')[0])
 
 
 def create_shingles(text, n=3):
@@ -217,18 +280,17 @@ def create_shingles(text, n=3):
 
 def hamming_distance(hash1, hash2):
     """Calculate number of differing bits"""
-    xor = hash1 ^ hash2
-    distance = 0
-    while xor:
-        distance += 1
-        xor &= xor - 1
-    return distance
+    return (hash1 ^ hash2).bit_count()
 
 
 def is_near_duplicate(simhash):
     """Check if simhash is similar to any seen simhash"""
-    for seen_hash, seen_url in seen_simhashes:
-        distance = hamming_distance(simhash, seen_hash)
-        if distance <= SIMHASH_THRESHOLD:
+    candidates = set()
+    for band, key in _simhash_band_keys(simhash):
+        with _band_locks[band]:
+            candidates.update(simhash_bands[band].get(key, ()))
+
+    for seen_hash in candidates:
+        if hamming_distance(simhash, seen_hash) <= SIMHASH_THRESHOLD:
             return True
     return False
\ No newline at end of file
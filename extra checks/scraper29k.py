@@ -1,11 +1,17 @@
 import re
 import os
+import csv
 import json
-import hashlib
+import time
+import xxhash
+import ahocorasick
+import numpy as np
 from hashlib import md5
 from urllib.parse import urlparse, urljoin, urldefrag, parse_qs
-from bs4 import BeautifulSoup
-from threading import Lock
+from lxml import etree, html as lxml_html
+from threading import Lock, Thread
+from queue import Queue, Empty
+from concurrent.futures import ProcessPoolExecutor
 from collections import deque, defaultdict, Counter
 from datetime import datetime
 
@@ -20,6 +26,23 @@ VALID_DOMAINS = (
     "stat.uci.edu"
 )
 
+# Domain membership as O(1) set probes on whole-label suffixes instead
+# of an endswith scan per valid domain. This also stops look-alike hosts
+# such as xics.uci.edu from slipping through: endswith matched on a raw
+# character boundary, the label join cannot.
+_VALID_SUFFIX_SET = set(VALID_DOMAINS)
+_VALID_MAX_LABELS = max(d.count('.') + 1 for d in VALID_DOMAINS)
+
+def _is_valid_domain(netloc):
+    """True if netloc equals or is a subdomain of a valid domain"""
+    labels = netloc.split('.')
+    for k in range(1, _VALID_MAX_LABELS + 1):
+        if k > len(labels):
+            break
+        if '.'.join(labels[-k:]) in _VALID_SUFFIX_SET:
+            return True
+    return False
+
 # Directories
 DATA_DIR = "crawl_data"
 LOG_DIR = "crawler_logs"
@@ -51,31 +74,73 @@ INVALID_EXTENSIONS = {
 # GLOBAL TRACKING
 # ============================================================
 
-# Progress tracking
+# Progress tracking. The counters are monotonic and only feed progress
+# displays, so the hot-path increments run bare (close enough under the
+# GIL); progress_lock only guards multi-field reads for printing.
 pages_processed = 0
 pages_saved = 0
 links_discovered = 0
 duplicates_found = 0  # New: track duplicates
 progress_lock = Lock()
 
-# Duplicate detection
+# Duplicate detection. The simhash window lives in a fixed uint64 ring
+# (URLs in a parallel list) so the whole window can be distance-checked
+# with one vectorized XOR + popcount instead of a Python loop per entry.
 seen_exact_hashes = set()
-seen_simhashes = deque(maxlen=SIMHASH_WINDOW)
+_sim_ring = np.zeros(SIMHASH_WINDOW, dtype=np.uint64)
+_sim_urls = [None] * SIMHASH_WINDOW
+_sim_pos = 0
+_sim_count = 0
 duplicate_lock = Lock()
 
+# Banded LSH over the ring: each fingerprint is bucketed by its four
+# 16-bit bands, and near-duplicates within the threshold share at least
+# one band with high probability, so only bucket-mates get a distance
+# check instead of the whole window. Buckets hold ring slot indices.
+SIMHASH_BANDS = 4
+SIMHASH_BAND_BITS = 16
+SIMHASH_BAND_MASK = (1 << SIMHASH_BAND_BITS) - 1
+
+simhash_band_index = [defaultdict(list) for _ in range(SIMHASH_BANDS)]
+
+def _simhash_band_keys(fingerprint):
+    """Yield (band, bucket key) pairs for a fingerprint"""
+    for band in range(SIMHASH_BANDS):
+        yield band, (fingerprint >> (SIMHASH_BAND_BITS * band)) & SIMHASH_BAND_MASK
+
 # Rejection tracking
 rejection_stats = Counter()
 rejection_samples = defaultdict(list)
 rejection_lock = Lock()
 
-# Processing tracking
-processing_log = []
-processing_lock = Lock()
-
-# Trap detection
-url_pattern_counter = defaultdict(int)
-domain_path_counter = defaultdict(lambda: defaultdict(int))
-trap_lock = Lock()
+# Processing tracking: workers drop entries on a queue and a background
+# thread owns the file handle, so log I/O never blocks a crawl thread
+_log_q = Queue()
+
+# Trap detection. Every worker thread validating links used to
+# serialize on one trap_lock; the counters are sharded 16 ways by key
+# hash with a lock per shard, so concurrent updates only contend when
+# their keys land in the same shard.
+_TRAP_SHARDS = 16
+url_pattern_shards = [defaultdict(int) for _ in range(_TRAP_SHARDS)]
+url_pattern_locks = [Lock() for _ in range(_TRAP_SHARDS)]
+domain_path_shards = [defaultdict(int) for _ in range(_TRAP_SHARDS)]
+domain_path_locks = [Lock() for _ in range(_TRAP_SHARDS)]
+
+def _inc_url_pattern(pattern):
+    """Bump and return the count for a URL pattern"""
+    shard = hash(pattern) & (_TRAP_SHARDS - 1)
+    with url_pattern_locks[shard]:
+        url_pattern_shards[shard][pattern] += 1
+        return url_pattern_shards[shard][pattern]
+
+def _inc_domain_path(domain, path):
+    """Bump and return the count for an exact (domain, path) pair"""
+    key = (domain, path)
+    shard = hash(key) & (_TRAP_SHARDS - 1)
+    with domain_path_locks[shard]:
+        domain_path_shards[shard][key] += 1
+        return domain_path_shards[shard][key]
 
 # ============================================================
 # DUPLICATE DETECTION - SIMHASH
@@ -94,42 +159,39 @@ def compute_simhash(text, hash_bits=64):
     Time Complexity: O(n) where n is number of words
     """
     words = text.split()
-    
+
     # Handle very short text
     if len(words) < 3:
-        return hash(text) & ((1 << hash_bits) - 1)
-    
+        return xxhash.xxh64_intdigest(text.encode('utf-8', errors='ignore'))
+
     # For large documents, sample shingles for performance
     if len(words) > 500:
         step = len(words) // 250
         shingles = [' '.join(words[i:i+3]) for i in range(0, len(words) - 2, step)]
     else:
         shingles = [' '.join(words[i:i+3]) for i in range(len(words) - 2)]
-    
+
     if not shingles:
         return 0
-    
-    # Initialize vector for weighted bits
-    vector = [0] * hash_bits
-    
-    # Hash each shingle and update vector
-    for shingle in shingles:
-        shingle_hash = hash(shingle) & ((1 << hash_bits) - 1)
-        
-        # Update vector based on bits in hash
-        for i in range(hash_bits):
-            if shingle_hash & (1 << i):
-                vector[i] += 1
-            else:
-                vector[i] -= 1
-    
-    # Generate final fingerprint
-    fingerprint = 0
-    for i in range(hash_bits):
-        if vector[i] > 0:
-            fingerprint |= (1 << i)
-    
-    return fingerprint
+
+    # xxh64 is a direct C call that already yields a native 64-bit int
+    # (no mask needed), and unlike hash() it is stable across runs, so
+    # fingerprints could be persisted alongside the crawl state
+    hashes = np.fromiter(
+        (xxhash.xxh64_intdigest(s.encode('ascii', errors='ignore'))
+         for s in shingles),
+        dtype=np.uint64, count=len(shingles))
+
+    # Unpack every hash into a row of bits, LSB in column 0 to match the
+    # old per-bit loop, then tally all rows in one vectorized pass:
+    # a column sum of s set bits gives vector[i] = 2*s - n
+    bits = np.unpackbits(
+        hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+    vector = 2 * bits.sum(axis=0, dtype=np.int64) - hashes.size
+
+    # Re-pack the sign bits into the final fingerprint
+    return int(np.packbits(
+        (vector > 0).astype(np.uint8), bitorder='little').view('<u8')[0])
 
 def hamming_distance(hash1, hash2):
     """
@@ -138,25 +200,27 @@ def hamming_distance(hash1, hash2):
     
     Time Complexity: O(1)
     """
-    return bin(hash1 ^ hash2).count('1')
+    # int.bit_count() lowers to a hardware popcount; bin() stringified the
+    # value and scanned it character by character
+    return (hash1 ^ hash2).bit_count()
 
-def is_duplicate(text_content, url):
+def is_duplicate(text_content, content_hash, url, content_simhash=None):
     """
-    Check if content is duplicate or near-duplicate
-    
+    Check if content is duplicate or near-duplicate.
+    content_hash is the xxh3 digest of the page text, computed once by
+    the caller and shared with save_page_data; content_simhash may also
+    be precomputed (e.g. in a pool worker alongside parsing).
+
     Returns: (is_dup, reason)
     - is_dup: True if duplicate
     - reason: 'exact' or 'similar' or None
     """
     global duplicates_found
-    
+
     # Minimum content check
     if not text_content or len(text_content.strip()) < 100:
         return True, 'too_short'
-    
-    # Compute exact hash
-    content_hash = hashlib.md5(text_content.encode('utf-8', errors='ignore')).hexdigest()
-    
+
     with duplicate_lock:
         # Check exact duplicate
         if content_hash in seen_exact_hashes:
@@ -166,57 +230,107 @@ def is_duplicate(text_content, url):
         # Add to exact hash set
         seen_exact_hashes.add(content_hash)
     
-    # Compute simhash for near-duplicate detection
-    content_simhash = compute_simhash(text_content)
-    
+    # Compute simhash for near-duplicate detection (unless the caller
+    # already did, e.g. in a pool worker)
+    if content_simhash is None:
+        content_simhash = compute_simhash(text_content)
+
+    global _sim_pos, _sim_count
+
     with duplicate_lock:
-        # Check near-duplicates (last N pages only for performance)
-        for seen_hash, seen_url in seen_simhashes:
-            distance = hamming_distance(content_simhash, seen_hash)
-            
-            if distance <= SIMHASH_THRESHOLD:
+        # Check near-duplicates against ring slots that share at least
+        # one band; one vectorized pass over just those candidates
+        candidates = set()
+        for band, key in _simhash_band_keys(content_simhash):
+            candidates.update(simhash_band_index[band].get(key, ()))
+
+        if candidates:
+            slots = np.fromiter(
+                candidates, dtype=np.intp, count=len(candidates))
+            distances = np.bitwise_count(
+                _sim_ring[slots] ^ np.uint64(content_simhash))
+            closest = int(np.argmin(distances))
+
+            if distances[closest] <= SIMHASH_THRESHOLD:
                 duplicates_found += 1
-                return True, f'similar_to_{seen_url[:50]}'
-        
-        # Not a duplicate - add to recent simhashes
-        seen_simhashes.append((content_simhash, url))
-    
+                return True, f'similar_to_{_sim_urls[int(slots[closest])][:50]}'
+
+        # Not a duplicate - take over the oldest ring slot, dropping the
+        # evicted fingerprint from the band index first
+        if _sim_count == SIMHASH_WINDOW:
+            evicted = int(_sim_ring[_sim_pos])
+            for band, key in _simhash_band_keys(evicted):
+                bucket = simhash_band_index[band].get(key)
+                if bucket:
+                    try:
+                        bucket.remove(_sim_pos)
+                    except ValueError:
+                        pass
+                    if not bucket:
+                        del simhash_band_index[band][key]
+
+        _sim_ring[_sim_pos] = content_simhash
+        _sim_urls[_sim_pos] = url
+        for band, key in _simhash_band_keys(content_simhash):
+            simhash_band_index[band][key].append(_sim_pos)
+        _sim_pos = (_sim_pos + 1) % SIMHASH_WINDOW
+        _sim_count = min(_sim_count + 1, SIMHASH_WINDOW)
+
     return False, None
 
 # ============================================================
 # LOGGING SYSTEM
 # ============================================================
 
+_log_fh = open(os.path.join(LOG_DIR, 'processing_log.csv'), 'a',
+               newline='', buffering=1 << 20)
+_log_writer = csv.writer(_log_fh)
+
+def _log_drainer():
+    """Background writer that owns the processing-log file handle"""
+    written = 0
+    while True:
+        # Drain greedily so bursts land in one writerows call
+        batch = [_log_q.get()]
+        try:
+            while len(batch) < 1000:
+                batch.append(_log_q.get_nowait())
+        except Empty:
+            pass
+
+        try:
+            _log_writer.writerows(
+                (datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S"),
+                 url, status, reason, links_found)
+                for ts, url, status, reason, links_found in batch)
+            written += len(batch)
+            # Flush periodically so a crash loses at most a batch
+            if written >= 100:
+                _log_fh.flush()
+                written = 0
+        except Exception as e:
+            print(f"[ERROR] Could not save processing log: {e}")
+        finally:
+            for _ in batch:
+                _log_q.task_done()
+
+_log_thread = Thread(target=_log_drainer, daemon=True)
+_log_thread.start()
+
 def log_processing(url, status, reason="", links_found=0):
     """
     Log every URL processed with reason
     Status: 'processed', 'rejected', 'skipped', 'error', 'duplicate'
+    A flat tuple of scalars costs a fraction of the old per-entry dict;
+    the drainer formats the timestamp and csv-encodes off-thread.
     """
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    with processing_lock:
-        processing_log.append({
-            'timestamp': timestamp,
-            'url': url,
-            'status': status,
-            'reason': reason,
-            'links_found': links_found
-        })
-    
-    # Save log periodically
-    if len(processing_log) % 100 == 0:
-        save_processing_log()
+    _log_q.put_nowait((time.time(), url, status, reason, links_found))
 
 def save_processing_log():
-    """Save processing log to file"""
+    """Wait for queued log entries to drain and force them to disk"""
     try:
-        log_file = os.path.join(LOG_DIR, 'processing_log.jsonl')
-        
-        with processing_lock:
-            with open(log_file, 'a') as f:
-                for entry in processing_log:
-                    f.write(json.dumps(entry) + '\n')
-            processing_log.clear()
+        _log_q.join()
+        _log_fh.flush()
     except Exception as e:
         print(f"[ERROR] Could not save processing log: {e}")
 
@@ -244,97 +358,134 @@ def print_progress():
 # CALENDAR & TRAP DETECTION
 # ============================================================
 
-CALENDAR_PATTERNS = [
-    r'/calendar',
-    r'/events?/',
-    r'/event-calendar',
-    r'/ical',
-    r'/\.ics$',
-    r'[?&]calendar',
-    r'[?&]event',
-    r'[?&]date=',
-    r'[?&]month=',
-    r'[?&]year=',
-    r'/\d{4}/\d{2}/\d{2}',
+# Nearly every pattern is a plain substring (the old `s?` and `[?&]`
+# regexes are just expanded into their alternatives here), so each group
+# is an Aho-Corasick automaton that scans the URL once in linear time
+# with no backtracking, instead of a regex alternation
+CALENDAR_SUBSTRINGS = [
+    '/calendar',
+    '/event/',
+    '/events/',
+    '/event-calendar',
+    '/ical',
+    '?calendar',
+    '&calendar',
+    '?event',
+    '&event',
+    '?date=',
+    '&date=',
+    '?month=',
+    '&month=',
+    '?year=',
+    '&year=',
 ]
 
-TRAP_PATTERNS = [
-    r'/wp-admin',
-    r'/wp-login',
-    r'/login',
-    r'/logout',
-    r'/signin',
-    r'/signout',
-    r'/register',
-    r'/signup',
-    r'/user/',
-    r'/account',
-    r'/profile',
-    r'/dashboard',
-    r'/admin',
+TRAP_SUBSTRINGS = [
+    '/wp-admin',
+    '/wp-login',
+    '/login',
+    '/logout',
+    '/signin',
+    '/signout',
+    '/register',
+    '/signup',
+    '/user/',
+    '/account',
+    '/profile',
+    '/dashboard',
+    '/admin',
 ]
 
-LEGITIMATE_PATTERNS = [
-    r'/wiki/',
-    r'/archive/',
-    r'/docs/',
-    r'/pub/',
-    r'/repository/',
-    r'/faculty/',
-    r'/courses?/',
-    r'/research/',
-    r'/projects?/',
+LEGITIMATE_SUBSTRINGS = [
+    '/wiki/',
+    '/archive/',
+    '/docs/',
+    '/pub/',
+    '/repository/',
+    '/faculty/',
+    '/course/',
+    '/courses/',
+    '/research/',
+    '/project/',
+    '/projects/',
 ]
 
+# The two calendar patterns that genuinely need a regex (anchored .ics
+# and numeric yyyy/mm/dd paths) stay as one small compiled alternation
+CALENDAR_RE = re.compile(r'/\.ics$|/\d{4}/\d{2}/\d{2}')
+
+# Whitespace collapser for text extraction, compiled once at import
+_WS_RE = re.compile(r'\s+')
+
+# Path normalizers for get_url_pattern, also hot per-link
+_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+_NUM_RE = re.compile(r'\d+')
 
+def _build_automaton(words):
+    """Build an Aho-Corasick automaton over literal substrings"""
+    automaton = ahocorasick.Automaton()
+    for word in words:
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    return automaton
 
-def is_calendar_or_event(url):
+def _matches_any(automaton, text):
+    """True if any of the automaton's words occurs in text"""
+    return next(automaton.iter(text), None) is not None
+
+CALENDAR_AC = _build_automaton(CALENDAR_SUBSTRINGS)
+TRAP_AC = _build_automaton(TRAP_SUBSTRINGS)
+LEGITIMATE_AC = _build_automaton(LEGITIMATE_SUBSTRINGS)
+
+def is_calendar_or_event(url, url_lower=None):
     """Detect calendar and event pages"""
-    url_lower = url.lower()
-    
-    for pattern in CALENDAR_PATTERNS:
-        if re.search(pattern, url_lower):
-            return True
-    
-    return False
+    url_lower = url_lower or url.lower()
+    return (_matches_any(CALENDAR_AC, url_lower)
+            or CALENDAR_RE.search(url_lower) is not None)
 
-def is_known_trap(url):
+def is_known_trap(url, url_lower=None):
     """Detect known crawler traps"""
-    url_lower = url.lower()
-    
-    for pattern in TRAP_PATTERNS:
-        if re.search(pattern, url_lower):
-            return True
-    
-    return False
+    return _matches_any(TRAP_AC, url_lower or url.lower())
 
-def is_url_trap(url):
+def is_legitimate_pattern(url, url_lower=None):
+    """Deep-but-legitimate sections that get looser trap limits"""
+    return _matches_any(LEGITIMATE_AC, url_lower or url.lower())
+
+def is_url_trap(url, parsed=None, url_lower=None):
     """Advanced trap detection"""
     try:
-        parsed = urlparse(url)
-        
+        # is_valid already parsed and lowercased the URL; only redo that
+        # work when called directly
+        if parsed is None:
+            parsed = urlparse(url)
+        if url_lower is None:
+            url_lower = url.lower()
+        legitimate = is_legitimate_pattern(url, url_lower)
+
         # Path depth check
         path_parts = [p for p in parsed.path.split('/') if p]
-        max_depth = 15 if is_legitimate_pattern(url) else MAX_PATH_DEPTH
-        
+        max_depth = 15 if legitimate else MAX_PATH_DEPTH
+
         if len(path_parts) > max_depth:
-            return True  
+            return True
 
-        # Repeating path segments
-        if not is_legitimate_pattern(url):
-            segment_counts = Counter(path_parts)
-            if any(count > 3 for count in segment_counts.values()):
-                return True   
+        # Repeating path segments; bail out on the first offender instead
+        # of building a full Counter just to scan its values
+        if not legitimate:
+            seen_segments = {}
+            for part in path_parts:
+                count = seen_segments.get(part, 0) + 1
+                if count > 3:
+                    return True
+                seen_segments[part] = count
 
         # Pattern frequency tracking
-        pattern = get_url_pattern(url)
-        
-        with trap_lock:
-            url_pattern_counter[pattern] += 1
-            max_repeats = 150 if is_legitimate_pattern(url) else 50
-            
-            if url_pattern_counter[pattern] > max_repeats:
-                return True  
+        pattern = get_url_pattern(url, parsed)
+
+        max_repeats = 150 if legitimate else 50
+
+        if _inc_url_pattern(pattern) > max_repeats:
+            return True
 
         # Pagination limits
         if parsed.query:
@@ -359,31 +510,31 @@ def is_url_trap(url):
             count = sum(1 for p in filter_params if p in query_lower)
             if count >= 3:
                 return True
-                domain = parsed.netloc
-        
+
+        domain = parsed.netloc
         path = parsed.path
-        
-        with trap_lock:
-            domain_path_counter[domain][path] += 1
-            
-            # If same exact path accessed more than 10 times, likely a trap
-            # (unless it's a legitimate pattern)
-            max_same_path = 20 if is_legitimate_pattern(url) else 10
-            
-            if domain_path_counter[domain][path] > max_same_path:
-                return True
+
+        # If same exact path accessed more than 10 times, likely a trap
+        # (unless it's a legitimate pattern)
+        max_same_path = 20 if legitimate else 10
+
+        if _inc_domain_path(domain, path) > max_same_path:
+            return True
 
         return False
     
     except Exception:
         return False
 
-def get_url_pattern(url):
+def get_url_pattern(url, parsed=None):
     """Get URL pattern for trap detection"""
     try:
-        parsed = urlparse(url)
-        path = re.sub(r'\d+', 'N', parsed.path)
-        path = re.sub(r'\d{4}-\d{2}-\d{2}', 'DATE', path)
+        if parsed is None:
+            parsed = urlparse(url)
+        # Dates first — once digit runs collapse to N there is nothing
+        # left for the date pattern to match
+        path = _DATE_RE.sub('DATE', parsed.path)
+        path = _NUM_RE.sub('N', path)
         query_keys = '&'.join(sorted(parse_qs(parsed.query).keys())) if parsed.query else ''
         return f"{parsed.netloc}{path}?{query_keys}"
     except Exception:
@@ -400,7 +551,10 @@ def is_valid(url):
     """
     try:
         parsed = urlparse(url)
-        
+        # Lowercase once up front; the pattern checks below all want the
+        # same string and URLs can run to hundreds of bytes
+        url_lower = url.lower()
+
         # Scheme check
         if parsed.scheme not in {"http", "https"}:
             log_rejection("bad_scheme", url)
@@ -408,7 +562,7 @@ def is_valid(url):
         
         # Domain check
         netloc = parsed.netloc.lower()
-        if not any(netloc.endswith(domain) for domain in VALID_DOMAINS):
+        if not _is_valid_domain(netloc):
             log_rejection("bad_domain", url)
             return False
         
@@ -418,17 +572,17 @@ def is_valid(url):
             return False
         
         # Calendar/Event pages
-        if is_calendar_or_event(url):
+        if is_calendar_or_event(url, url_lower):
             log_rejection("calendar_event", url)
             return False
-        
+
         # Known traps
-        if is_known_trap(url):
+        if is_known_trap(url, url_lower):
             log_rejection("known_trap", url)
             return False
-        
+
         # Dynamic traps
-        if is_url_trap(url):
+        if is_url_trap(url, parsed, url_lower):
             log_rejection("url_trap", url)
             return False
         
@@ -444,7 +598,7 @@ def is_valid(url):
                     return False
         
         # Search/print/share endpoints
-        if any(x in url.lower() for x in ['/search?', '?search=', '/print/', '?print=', '/share/', '?share=']):
+        if any(x in url_lower for x in ['/search?', '?search=', '/print/', '?print=', '/share/', '?share=']):
             log_rejection("action_endpoint", url, save_sample=False)
             return False
         
@@ -458,6 +612,36 @@ def is_valid(url):
 # MAIN SCRAPER
 # ============================================================
 
+# CPU pool for the parse/fingerprint stage, created on first use so
+# merely importing this module never forks workers
+_cpu_pool = None
+_cpu_pool_lock = Lock()
+
+def _get_cpu_pool():
+    global _cpu_pool
+    if _cpu_pool is None:
+        with _cpu_pool_lock:
+            if _cpu_pool is None:
+                _cpu_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _cpu_pool
+
+def _parse_page_cpu(content):
+    """CPU-bound half of page processing, run in a pool worker process:
+    parse the HTML, pull hrefs and text, and fingerprint the text.
+    Returns (text_content, hrefs, content_hash, content_simhash)."""
+    tree = lxml_html.fromstring(content)
+    hrefs = tree.xpath('//a/@href')
+
+    text_content = extract_text_content(tree)
+
+    # Encode and hash once; the duplicate check and save_page_data
+    # share the same digest instead of re-encoding ~100KB of text
+    text_bytes = text_content.encode('utf-8', errors='ignore')
+    content_hash = xxhash.xxh3_64(text_bytes).hexdigest()
+    content_simhash = compute_simhash(text_content)
+
+    return text_content, list(hrefs), content_hash, content_simhash
+
 def scraper(url, resp):
     """
     Main scraper function with comprehensive logging and duplicate detection
@@ -465,11 +649,11 @@ def scraper(url, resp):
     global pages_processed, pages_saved, links_discovered
     
     # Update progress
-    with progress_lock:
-        pages_processed += 1
-        
-        # Print progress every 10 pages
-        if pages_processed % 10 == 0:
+    pages_processed += 1
+
+    # Print progress every 10 pages
+    if pages_processed % 10 == 0:
+        with progress_lock:
             print(f"[PROGRESS] Processed: {pages_processed}, Saved: {pages_saved}, Duplicates: {duplicates_found}, Links: {links_discovered}")
     
     # Check response
@@ -489,49 +673,48 @@ def scraper(url, resp):
             log_processing(url, 'skipped', 'too_large')
             return []
         
-        # Parse HTML
-        soup = BeautifulSoup(content, "lxml")
-        
-        # Extract text
-        text_content = extract_text_content_from_soup(soup)
-        
+        # Parsing, text extraction and fingerprinting are the CPU-heavy
+        # part of a page; ship them to a pool worker process so the GIL
+        # never serializes them across crawl threads. The dedup state
+        # stays in this process — only pure functions run in the pool.
+        text_content, hrefs, content_hash, content_simhash = \
+            _get_cpu_pool().submit(_parse_page_cpu, content).result()
+
         # Check word count
         words = text_content.split()
         if len(words) < MIN_WORD_COUNT:
             log_processing(url, 'skipped', f'low_words_{len(words)}')
             return []
-        
+
         # ===== DUPLICATE DETECTION =====
-        is_dup, dup_reason = is_duplicate(text_content, url)
+        is_dup, dup_reason = is_duplicate(
+            text_content, content_hash, url, content_simhash)
         
         if is_dup:
             log_processing(url, 'duplicate', dup_reason)
             # Still extract links even from duplicates
-            links = extract_next_links_from_soup(url, soup)
+            links = extract_next_links(url, hrefs)
             valid_links = [link for link in links if is_valid(link)]
-            
-            with progress_lock:
-                links_discovered += len(valid_links)
-            
+
+            links_discovered += len(valid_links)
+
             return valid_links
         
         # ===== NOT A DUPLICATE - PROCEED =====
         
         # Extract links
-        links = extract_next_links_from_soup(url, soup)
+        links = extract_next_links(url, hrefs)
         
         # Filter valid links
         valid_links = [link for link in links if is_valid(link)]
         
         # Update link count
-        with progress_lock:
-            links_discovered += len(valid_links)
-        
+        links_discovered += len(valid_links)
+
         # Save page data (only unique, quality content)
         if len(valid_links) > 0 or len(words) > 200:
-            save_page_data(url, words, text_content)
-            with progress_lock:
-                pages_saved += 1
+            save_page_data(url, words, content_hash)
+            pages_saved += 1
         
         # Log successful processing
         log_processing(url, 'processed', 'success', len(valid_links))
@@ -546,64 +729,112 @@ def scraper(url, resp):
 # HELPER FUNCTIONS
 # ============================================================
 
-def extract_text_content_from_soup(soup):
-    """Extract visible text from HTML"""
+def extract_text_content(tree):
+    """Extract visible text from a parsed lxml tree"""
     try:
-        for tag in soup(["script", "style", "meta", "link", "noscript", "header", "footer", "nav"]):
-            tag.decompose()
-        
-        text = soup.get_text(separator=' ', strip=True)
-        text = re.sub(r'\s+', ' ', text)
-        
+        # One C traversal drops all the non-content tags at once instead
+        # of a Python decompose() call per matching element
+        etree.strip_elements(
+            tree, "script", "style", "meta", "link", "noscript",
+            "header", "footer", "nav", with_tail=False)
+
+        text = _WS_RE.sub(' ', tree.text_content())
+
         return text.strip()
     except Exception:
         return ""
 
-def extract_next_links_from_soup(url, soup):
-    """Extract all valid links from HTML"""
+def extract_next_links(url, hrefs):
+    """Resolve raw href values (from tree.xpath('//a/@href')) into links"""
     links = set()
-    
+
     try:
-        for tag in soup.find_all("a", href=True):
-            href = tag.get("href")
-            
+        for href in hrefs:
             if not href or href.strip() in ['#', 'javascript:void(0)', 'javascript:;']:
                 continue
-            
+
             try:
                 absolute_url = urljoin(url, href)
             except Exception:
                 continue
-            
+
             clean_url, _ = urldefrag(absolute_url)
-            
+
             if clean_url and clean_url != url:
                 links.add(clean_url)
     except Exception:
         pass
-    
+
     return list(links)
 
-def save_page_data(url, words, text_content):
-    """Save page metadata to JSON"""
+# Page records stream through a queue to a background writer that
+# appends to 256 JSONL shard files keyed by the first hash byte, so the
+# crawl threads never open files and DATA_DIR stays at a size every
+# filesystem handles well (a flat dir of millions of entries does not)
+_data_q = Queue()
+_data_fhs = {}
+
+def _data_drainer():
+    """Background writer that owns the page-data shard handles"""
+    written = 0
+    while True:
+        # Drain greedily so bursts land in few write calls
+        batch = [_data_q.get()]
+        try:
+            while len(batch) < 256:
+                batch.append(_data_q.get_nowait())
+        except Empty:
+            pass
+
+        try:
+            for url_hash, data in batch:
+                shard = url_hash[:2]
+                fh = _data_fhs.get(shard)
+                if fh is None:
+                    fh = _data_fhs[shard] = open(
+                        os.path.join(DATA_DIR, f"pages_{shard}.jsonl"), 'a',
+                        buffering=1 << 20)
+                fh.write(json.dumps(data) + '\n')
+            written += len(batch)
+            # Flush periodically so a crash loses at most a batch
+            if written >= 100:
+                for fh in _data_fhs.values():
+                    fh.flush()
+                written = 0
+        except Exception as e:
+            print(f"[ERROR] Could not save page data: {e}")
+        finally:
+            for _ in batch:
+                _data_q.task_done()
+
+_data_thread = Thread(target=_data_drainer, daemon=True)
+_data_thread.start()
+
+def save_page_data(url, words, content_hash):
+    """Queue page metadata for the background writer"""
     try:
         url_hash = md5(url.encode('utf-8')).hexdigest()
-        
-        # Compute content hash for verification
-        content_hash = hashlib.md5(text_content.encode('utf-8', errors='ignore')).hexdigest()
-        
+
         data = {
             'url': url,
             'word_count': len(words),
             'words': words[:1000],  # First 1000 words
             'content_hash': content_hash  # Store hash for verification
         }
-        
-        with open(os.path.join(DATA_DIR, f"{url_hash}.json"), 'w') as f:
-            json.dump(data, f)
+
+        _data_q.put_nowait((url_hash, data))
     except Exception:
         pass
 
+def flush_page_data():
+    """Wait for queued page records to drain and force them to disk"""
+    try:
+        _data_q.join()
+        for fh in _data_fhs.values():
+            fh.flush()
+    except Exception as e:
+        print(f"[ERROR] Could not save page data: {e}")
+
 # ============================================================
 # REPORTING
 # ============================================================
@@ -631,7 +862,7 @@ def print_final_report():
     print(f"\n🔍 DUPLICATE DETECTION:")
     with duplicate_lock:
         print(f"  Exact hashes tracked:  {len(seen_exact_hashes):,}")
-        print(f"  Simhashes tracked:     {len(seen_simhashes):,}")
+        print(f"  Simhashes tracked:     {_sim_count:,}")
         print(f"  Simhash threshold:     {SIMHASH_THRESHOLD} bits")
     
     print(f"\n❌ REJECTIONS:")
@@ -653,6 +884,7 @@ def print_final_report():
     
     # Save final logs
     save_processing_log()
+    flush_page_data()
     save_rejection_report()
     save_duplicate_report()
 
@@ -699,14 +931,14 @@ def save_duplicate_report():
                     f.write(f"Duplicate rate:         {dup_rate:.1f}%\n\n")
                 
                 f.write(f"Algorithm:\n")
-                f.write(f"  - Exact duplicate detection: MD5 hash\n")
+                f.write(f"  - Exact duplicate detection: xxh3 hash\n")
                 f.write(f"  - Near-duplicate detection: Simhash\n")
                 f.write(f"  - Simhash threshold: {SIMHASH_THRESHOLD} bits\n")
                 f.write(f"  - Simhash window: {SIMHASH_WINDOW} recent pages\n\n")
                 
                 f.write(f"Statistics:\n")
                 f.write(f"  - Exact hashes tracked: {len(seen_exact_hashes):,}\n")
-                f.write(f"  - Simhashes in memory: {len(seen_simhashes):,}\n")
+                f.write(f"  - Simhashes in memory: {_sim_count:,}\n")
     except Exception:
         pass
 
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Verify crawler completion and generate report"""
 
-import shelve
+import sqlite3
 import os
 from collections import Counter
 from urllib.parse import urlparse
@@ -14,15 +14,14 @@ def analyze_completion():
     
     # Check frontier
     try:
-        db = shelve.open('frontier.shelve', 'r')
-        
-        total_urls = len(db)
+        db = sqlite3.connect('file:frontier.shelve?mode=ro', uri=True)
+
         completed_urls = []
         pending_urls = []
-        
+
         status_by_domain = Counter()
-        
-        for url_hash, (url, completed) in db.items():
+
+        for url, completed in db.execute("SELECT url, completed FROM urls"):
             domain = urlparse(url).netloc
             
             if completed:
@@ -32,7 +31,9 @@ def analyze_completion():
                 pending_urls.append(url)
         
         db.close()
-        
+
+        total_urls = len(completed_urls) + len(pending_urls)
+
         # Print results
         print(f"📊 FRONTIER ANALYSIS")
         print("-" * 80)
@@ -2,13 +2,15 @@
 import re
 import os
 import json
+import time
 import hashlib
 from hashlib import md5
 from urllib.parse import urlparse, urljoin, urldefrag, parse_qs
-from bs4 import BeautifulSoup
+import numpy as np
+from lxml import etree
 from threading import Lock
-from collections import deque, defaultdict, Counter
-from datetime import datetime
+from collections import defaultdict, deque, Counter
+from functools import lru_cache
 
 VALID_DOMAINS = (
     "ics.uci.edu",
@@ -17,6 +19,20 @@ VALID_DOMAINS = (
     "stat.uci.edu"
 )
 
+BLOCKED_DOMAINS = (
+    'physics.uci.edu', 'economics.uci.edu', 'chem.uci.edu',
+    'bio.uci.edu', 'math.uci.edu', 'engineering.uci.edu',
+    'cecs.uci.edu', 'eecs.uci.edu', 'nacs.uci.edu',
+)
+
+# str.endswith with a tuple checks every suffix in a single C call; exact
+# hostnames go through a set lookup (a bare-domain suffix match would
+# wrongly accept e.g. statistics.uci.edu for ics.uci.edu)
+_VALID_DOMAIN_SET = frozenset(VALID_DOMAINS)
+_VALID_SUFFIXES = tuple('.' + d for d in VALID_DOMAINS)
+_BLOCKED_DOMAIN_SET = frozenset(BLOCKED_DOMAINS)
+_BLOCKED_SUFFIXES = tuple('.' + d for d in BLOCKED_DOMAINS)
+
 DATA_DIR = "crawl_data"
 LOG_DIR = "crawler_logs"
 
@@ -53,16 +69,39 @@ links_discovered = 0
 duplicates_found = 0
 progress_lock = Lock()
 
+SIMHASH_BANDS = 4
+SIMHASH_BAND_BITS = 16
+SIMHASH_BAND_MASK = (1 << SIMHASH_BAND_BITS) - 1
+
 seen_exact_hashes = set()
-seen_simhashes = deque(maxlen=SIMHASH_WINDOW)
+# The simhash window is stored structure-of-arrays style: fingerprints in a
+# fixed uint64 ring buffer (contiguous, so candidate distances vectorize to
+# one XOR + popcount pass), URLs in a parallel list. _sim_pos is the next
+# slot to overwrite once the window is full.
+_sim_ring = np.zeros(SIMHASH_WINDOW, dtype=np.uint64)
+_sim_urls = [None] * SIMHASH_WINDOW
+_sim_pos = 0
+_sim_count = 0
+# Banded LSH index: near-duplicates within the hamming threshold share at
+# least one 16-bit band with high probability, so each lookup only compares
+# against the handful of fingerprints in matching buckets instead of
+# scanning the whole window. Buckets hold ring-buffer slot indices.
+simhash_band_index = [defaultdict(list) for _ in range(SIMHASH_BANDS)]
 duplicate_lock = Lock()
 
+def _simhash_band_keys(fingerprint):
+    for band in range(SIMHASH_BANDS):
+        yield band, (fingerprint >> (band * SIMHASH_BAND_BITS)) & SIMHASH_BAND_MASK
+
 rejection_stats = Counter()
 rejection_samples = defaultdict(list)
 rejection_lock = Lock()
 
-processing_log = []
-processing_lock = Lock()
+# deque.append/popleft are atomic under the GIL, so workers log without
+# taking any lock; only the flush side serializes (two threads crossing
+# the batch threshold together would interleave their file writes)
+processing_log = deque()
+_flush_lock = Lock()
 
 url_pattern_counter = defaultdict(int)
 domain_path_counter = defaultdict(lambda: defaultdict(int))
@@ -72,82 +111,127 @@ def compute_simhash(text, hash_bits=64):
     words = text.split()
     if len(words) < 3:
         return hash(text) & ((1 << hash_bits) - 1)
-    
+
     if len(words) > 500:
         step = len(words) // 250
-        shingles = [' '.join(words[i:i+3]) for i in range(0, len(words) - 2, step)]
     else:
-        shingles = [' '.join(words[i:i+3]) for i in range(len(words) - 2)]
-    
-    if not shingles:
+        step = 1
+
+    # Hash the word triples as tuples; tuple hashing is built-in C and
+    # avoids materializing a joined string per shingle
+    mask = (1 << hash_bits) - 1
+    hashes = np.fromiter(
+        (hash((words[i], words[i+1], words[i+2])) & mask
+         for i in range(0, len(words) - 2, step)),
+        dtype=np.uint64)
+
+    if hashes.size == 0:
         return 0
-    
-    vector = [0] * hash_bits
-    for shingle in shingles:
-        shingle_hash = hash(shingle) & ((1 << hash_bits) - 1)
-        for i in range(hash_bits):
-            if shingle_hash & (1 << i):
-                vector[i] += 1
-            else:
-                vector[i] -= 1
-    
-    fingerprint = 0
-    for i in range(hash_bits):
-        if vector[i] > 0:
-            fingerprint |= (1 << i)
-    
-    return fingerprint
+
+    # Unpack the shingle hashes into an (N, 64) bit matrix and sum the
+    # columns in one vectorized reduction instead of 64 Python bit tests
+    # per shingle. Bytes are reversed so column 0 is the most significant
+    # bit, matching the packbits step below.
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8)[:, ::-1], axis=1)
+    vector = 2 * bits.sum(axis=0, dtype=np.int64) - hashes.size
+
+    fingerprint_bits = (vector > 0).astype(np.uint8)
+    return int(np.packbits(fingerprint_bits).view('>u8')[0])
 
 def hamming_distance(hash1, hash2):
-    return bin(hash1 ^ hash2).count('1')
+    return (hash1 ^ hash2).bit_count()
+
+def is_duplicate(content_hash, text_content, url):
+    global duplicates_found, _sim_pos, _sim_count
 
-def is_duplicate(text_content, url):
-    global duplicates_found
-    
     if not text_content or len(text_content.strip()) < 100:
         return True, 'too_short'
-    
-    content_hash = hashlib.md5(text_content.encode('utf-8', errors='ignore')).hexdigest()
-    
+
+    # The exact hash comes precomputed from the caller (shared with
+    # save_page_data) and the simhash is computed before taking the lock,
+    # so the critical section is only set/dict lookups and inserts.
+    content_simhash = compute_simhash(text_content)
+
     with duplicate_lock:
         if content_hash in seen_exact_hashes:
             duplicates_found += 1
             return True, 'exact'
         seen_exact_hashes.add(content_hash)
-    
-    content_simhash = compute_simhash(text_content)
-    
-    with duplicate_lock:
-        for seen_hash, seen_url in seen_simhashes:
-            if hamming_distance(content_simhash, seen_hash) <= SIMHASH_THRESHOLD:
+
+        candidate_slots = set()
+        for band, key in _simhash_band_keys(content_simhash):
+            bucket = simhash_band_index[band].get(key)
+            if bucket:
+                candidate_slots.update(bucket)
+
+        if candidate_slots:
+            slots = np.fromiter(candidate_slots, dtype=np.intp,
+                                count=len(candidate_slots))
+            distances = np.bitwise_count(_sim_ring[slots] ^ np.uint64(content_simhash))
+            if np.any(distances <= SIMHASH_THRESHOLD):
                 duplicates_found += 1
                 return True, 'similar'
-        seen_simhashes.append((content_simhash, url))
-    
+
+        # Overwrite the oldest slot once the window is full, dropping the
+        # evicted fingerprint from its band buckets
+        if _sim_count >= SIMHASH_WINDOW:
+            old_hash = int(_sim_ring[_sim_pos])
+            for band, key in _simhash_band_keys(old_hash):
+                bucket = simhash_band_index[band][key]
+                bucket.remove(_sim_pos)
+                if not bucket:
+                    del simhash_band_index[band][key]
+
+        _sim_ring[_sim_pos] = content_simhash
+        _sim_urls[_sim_pos] = url
+        for band, key in _simhash_band_keys(content_simhash):
+            simhash_band_index[band][key].append(_sim_pos)
+        _sim_pos = (_sim_pos + 1) % SIMHASH_WINDOW
+        _sim_count = min(_sim_count + 1, SIMHASH_WINDOW)
+
     return False, None
 
 def log_processing(url, status, reason="", links_found=0):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with processing_lock:
-        processing_log.append({
-            'timestamp': timestamp,
-            'url': url,
-            'status': status,
-            'reason': reason,
-            'links_found': links_found
-        })
-    if len(processing_log) % 100 == 0:
+    # Store the raw epoch time; formatting happens in batch at flush time
+    # instead of running strftime on the per-page hot path
+    processing_log.append({
+        'ts': time.time(),
+        'url': url,
+        'status': status,
+        'reason': reason,
+        'links_found': links_found
+    })
+    if len(processing_log) >= 100:
         save_processing_log()
 
 def save_processing_log():
     try:
-        with processing_lock:
-            if not processing_log:
+        # One flusher at a time: a concurrent caller just returns and
+        # leaves its entries for the thread already holding the lock
+        if not _flush_lock.acquire(blocking=False):
+            return
+        try:
+            # Drain entry by entry with atomic popleft, then do the slow
+            # file I/O so workers logging pages are never blocked on disk
+            entries = []
+            while True:
+                try:
+                    entries.append(processing_log.popleft())
+                except IndexError:
+                    break
+            if not entries:
                 return
+            lines = []
+            for entry in entries:
+                ts = entry.pop('ts')
+                lines.append(json.dumps({
+                    'timestamp': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts)),
+                    **entry
+                }))
             with open(os.path.join(LOG_DIR, 'processing_log.jsonl'), 'a') as f:
-                for entry in processing_log:
-                    f.write(json.dumps(entry) + '\\n')
-            processing_log.clear()
+                f.write('\n'.join(lines) + '\n')
+        finally:
+            _flush_lock.release()
     except Exception:
         pass
 
@@ -159,7 +243,7 @@ def log_rejection(reason, url, save_sample=True):
 
 CALENDAR_PATTERNS = [
     r'/calendar', r'/events?/', r'/event-calendar', r'/ical',
-    r'/\\.ics$', r'[?&]calendar', r'[?&]event',
+    r'/\.ics$', r'[?&]calendar', r'[?&]event',
 ]
 
 TRAP_PATTERNS = [
@@ -174,41 +258,52 @@ LEGITIMATE_PATTERNS = [
     r'/people', r'/graduate', r'/undergraduate',
 ]
 
+# Compile each pattern list into a single alternation once at import time,
+# so each predicate is one regex search instead of a Python loop
+CALENDAR_RE = re.compile('|'.join(f'(?:{p})' for p in CALENDAR_PATTERNS), re.IGNORECASE)
+TRAP_RE = re.compile('|'.join(f'(?:{p})' for p in TRAP_PATTERNS), re.IGNORECASE)
+LEGITIMATE_RE = re.compile('|'.join(f'(?:{p})' for p in LEGITIMATE_PATTERNS), re.IGNORECASE)
+
 def is_calendar_or_event(url):
-    return any(re.search(p, url.lower()) for p in CALENDAR_PATTERNS)
+    return CALENDAR_RE.search(url) is not None
 
 def is_known_trap(url):
-    return any(re.search(p, url.lower()) for p in TRAP_PATTERNS)
+    return TRAP_RE.search(url) is not None
 
+@lru_cache(maxsize=65536)
 def is_legitimate_pattern(url):
-    return any(re.search(p, url.lower()) for p in LEGITIMATE_PATTERNS)
+    return LEGITIMATE_RE.search(url) is not None
 
-def is_url_trap(url):
+def is_url_trap(url, parsed=None):
     try:
-        parsed = urlparse(url)
+        if parsed is None:
+            parsed = urlparse(url)
         path_parts = [p for p in parsed.path.split('/') if p]
-        
-        # 1. Path depth 
-        max_depth = 25 if is_legitimate_pattern(url) else MAX_PATH_DEPTH
+        # Evaluated once and reused; the old code re-ran the regex for
+        # every individual check below
+        legitimate = is_legitimate_pattern(url)
+
+        # 1. Path depth
+        max_depth = 25 if legitimate else MAX_PATH_DEPTH
         if len(path_parts) > max_depth:
             return True
-        
+
         # 2. Repeating segments - ONLY if EXTREMELY excessive
-        if not is_legitimate_pattern(url):
+        if not legitimate:
             segment_counts = Counter(path_parts)
             if any(count > 5 for count in segment_counts.values()):
                 return True
-        
-        # 3. Pattern frequency 
+
+        # 3. Pattern frequency
         pattern = get_url_pattern(url)
         with trap_lock:
             url_pattern_counter[pattern] += 1
             # Massive increase
-            max_repeats = 300 if is_legitimate_pattern(url) else 150
+            max_repeats = 300 if legitimate else 150
             if url_pattern_counter[pattern] > max_repeats:
                 return True
-        
-        # 4. Pagination 
+
+        # 4. Pagination
         if parsed.query:
             query_params = parse_qs(parsed.query)
             for param in ['page', 'p', 'offset', 'start']:
@@ -230,10 +325,10 @@ def is_url_trap(url):
             if sum(1 for p in filter_params if p in query_lower) >= 5:  
                 return True
         
-        # 7. Same path repeats 
+        # 7. Same path repeats
         with trap_lock:
             domain_path_counter[parsed.netloc][parsed.path] += 1
-            max_same = 50 if is_legitimate_pattern(url) else 30  
+            max_same = 50 if legitimate else 30
             if domain_path_counter[parsed.netloc][parsed.path] > max_same:
                 return True
         
@@ -241,12 +336,25 @@ def is_url_trap(url):
     except Exception:
         return False
 
+_DIGIT_RE = re.compile(r'\d+')
+_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+# Bad format parameters and action endpoints checked in one scan; the named
+# groups keep the rejection reasons distinct
+_BAD_URL_RE = re.compile(
+    r'(?P<format>format=(?:txt|pdf|csv)|export=(?:txt|pdf)|download=)'
+    r'|(?P<action>/search\?|\?search=)',
+    re.IGNORECASE)
+
+@lru_cache(maxsize=65536)
 def get_url_pattern(url):
     try:
         parsed = urlparse(url)
-        path = re.sub(r'\\d+', 'N', parsed.path)
-        path = re.sub(r'\\d{4}-\\d{2}-\\d{2}', 'DATE', path)
-        
+        # Dates first — once digit runs collapse to N there is nothing
+        # left for the date pattern to match
+        path = _DATE_RE.sub('DATE', parsed.path)
+        path = _DIGIT_RE.sub('N', path)
+
         # Don't track query for legitimate patterns
         if is_legitimate_pattern(url):
             return f"{parsed.netloc}{path}"
@@ -257,8 +365,12 @@ def get_url_pattern(url):
     except Exception:
         return url
 
-def is_valid(url):
-    """MINIMAL validation - only block obvious bad URLs"""
+@lru_cache(maxsize=200000)
+def _is_valid_core(url):
+    """Cached validation core - validity is deterministic in the URL text,
+    and the same nav/footer links appear on nearly every page, so repeat
+    URLs skip the parse/regex work entirely. Rejections are logged on
+    cache miss only."""
     try:
         parsed = urlparse(url)
         
@@ -267,25 +379,14 @@ def is_valid(url):
             log_rejection("bad_scheme", url, False)
             return False
         
-        # 2. Domain 
+        # 2. Domain
         netloc = parsed.netloc.lower()
-        is_valid_domain = any(
-            netloc == d or netloc.endswith('.' + d) 
-            for d in VALID_DOMAINS
-        )
-        
-        if not is_valid_domain:
+        if netloc not in _VALID_DOMAIN_SET and not netloc.endswith(_VALID_SUFFIXES):
             log_rejection("bad_domain", url, False)
             return False
-        
+
         # 3. Blocked domains
-        blocked = [
-            'physics.uci.edu', 'economics.uci.edu', 'chem.uci.edu',
-            'bio.uci.edu', 'math.uci.edu', 'engineering.uci.edu',
-            'cecs.uci.edu', 'eecs.uci.edu', 'nacs.uci.edu',
-        ]
-        
-        if any(netloc == b or netloc.endswith('.' + b) for b in blocked):
+        if netloc in _BLOCKED_DOMAIN_SET or netloc.endswith(_BLOCKED_SUFFIXES):
             log_rejection("blocked_domain", url, False)
             return False
         
@@ -304,44 +405,39 @@ def is_valid(url):
             log_rejection("known_trap", url)
             return False
         
-        # 7. Dynamic traps 
-        if is_url_trap(url):
+        # 7. Dynamic traps
+        if is_url_trap(url, parsed):
             log_rejection("url_trap", url, False)
             return False
         
-        path_lower = parsed.path.lower()
-        
-        # 8. File extensions 
-        if "." in path_lower:
-            parts = path_lower.rsplit('.', 1)
-            if len(parts) == 2:
-                ext = parts[1].split('/')[0].split('?')[0]
-                
-                # Allow extensionless URLs and web page extensions
-                # Block binary/document files
-                if ext and ext not in ALLOWED_EXTENSIONS and ext in INVALID_EXTENSIONS:
-                    log_rejection(f"ext_{ext}", url, False)
-                    return False
-        
-        # 9. Format parameters 
-        if parsed.query:
-            query_lower = parsed.query.lower()
-            bad_formats = ['format=txt', 'format=pdf', 'format=csv',
-                         'export=txt', 'export=pdf', 'download=']
-            if any(b in query_lower for b in bad_formats):
-                log_rejection("format_param", url, False)
+        # 8. File extensions - only the extension itself needs lowercasing,
+        # not a copy of the whole path
+        path = parsed.path
+        if "." in path:
+            ext = path.rsplit('.', 1)[1].split('/')[0].split('?')[0].lower()
+
+            # Allow extensionless URLs and web page extensions
+            # Block binary/document files
+            if ext and ext not in ALLOWED_EXTENSIONS and ext in INVALID_EXTENSIONS:
+                log_rejection(f"ext_{ext}", url, False)
                 return False
         
-        # 10. Action endpoints
-        if any(x in url.lower() for x in ['/search?', '?search=']):
-            log_rejection("action", url, False)
+        # 9/10. Format parameters and action endpoints
+        match = _BAD_URL_RE.search(url)
+        if match:
+            reason = "format_param" if match.lastgroup == 'format' else "action"
+            log_rejection(reason, url, False)
             return False
-        
+
         return True
-    
+
     except Exception:
         return False
 
+def is_valid(url):
+    """MINIMAL validation - only block obvious bad URLs"""
+    return _is_valid_core(url)
+
 def scraper(url, resp):
     global pages_processed, pages_saved, links_discovered
     
@@ -355,42 +451,50 @@ def scraper(url, resp):
         return []
     
     try:
-        content = resp.raw_response.content
-        
-        if not content or len(content) < 100:
-            log_processing(url, 'skipped', 'empty')
-            return []
-        
-        if len(content) > MAX_CONTENT_SIZE:
+        raw = resp.raw_response
+        iter_content = getattr(raw, 'iter_content', None)
+        if iter_content is not None:
+            # Stream chunks through the parser so oversized pages abort
+            # without materializing (or parsing) the whole body
+            chunks = iter_content(chunk_size=_STREAM_CHUNK_SIZE)
+        else:
+            chunks = (raw.content or b"",)
+
+        text_content, hrefs, total_bytes = parse_page(chunks)
+
+        if text_content is None:
             log_processing(url, 'skipped', 'large')
             return []
-        
-        soup = BeautifulSoup(content, "lxml")
-        text_content = extract_text_content_from_soup(soup)
+
+        if total_bytes < 100:
+            log_processing(url, 'skipped', 'empty')
+            return []
+
         words = text_content.split()
         
         if len(words) < MIN_WORD_COUNT:
             log_processing(url, 'skipped', f'low_words_{len(words)}')
             return []
+
+        # Encode and hash the page text once; both duplicate detection and
+        # save_page_data use the same digest
+        content_hash = hashlib.md5(text_content.encode('utf-8', errors='ignore')).hexdigest()
+        is_dup, dup_reason = is_duplicate(content_hash, text_content, url)
         
-        is_dup, dup_reason = is_duplicate(text_content, url)
-        
+        links = extract_next_links(url, hrefs)
+        valid_links = [link for link in links if is_valid(link)]
+
         if is_dup:
             log_processing(url, 'duplicate', dup_reason)
-            links = extract_next_links_from_soup(url, soup)
-            valid_links = [link for link in links if is_valid(link)]
             with progress_lock:
                 links_discovered += len(valid_links)
             return valid_links
         
-        links = extract_next_links_from_soup(url, soup)
-        valid_links = [link for link in links if is_valid(link)]
-        
         with progress_lock:
             links_discovered += len(valid_links)
         
         if len(valid_links) > 0 or len(words) > 200:
-            save_page_data(url, words, text_content)
+            save_page_data(url, words, content_hash)
             with progress_lock:
                 pages_saved += 1
         
@@ -401,41 +505,82 @@ def scraper(url, resp):
         log_processing(url, 'error', str(e)[:30])
         return []
 
-def extract_text_content_from_soup(soup):
-    try:
-        for tag in soup(["script", "style", "meta", "link", "noscript", "header", "footer", "nav"]):
-            tag.decompose()
-        text = soup.get_text(separator=' ', strip=True)
-        return re.sub(r'\\s+', ' ', text).strip()
-    except Exception:
-        return ""
+_SKIP_TAGS = frozenset(
+    ["script", "style", "meta", "link", "noscript", "header", "footer", "nav"])
 
-def extract_next_links_from_soup(url, soup):
-    links = set()
+class _PageTarget:
+    """lxml parser target that collects anchor hrefs and visible text in a
+    single pass over the document, ignoring non-content subtrees."""
+
+    def __init__(self):
+        self.hrefs = []
+        self.text_parts = []
+        self._skip_depth = 0
+
+    def start(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == 'a':
+            href = attrs.get('href')
+            if href:
+                self.hrefs.append(href)
+
+    def end(self, tag):
+        if tag in _SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def data(self, data):
+        if not self._skip_depth:
+            self.text_parts.append(data)
+
+    def close(self):
+        pass
+
+_STREAM_CHUNK_SIZE = 65536
+
+def parse_page(chunks):
+    """Feed byte chunks through the single-pass parser, aborting as soon
+    as the size cap is exceeded. Returns (text, raw hrefs, total_bytes);
+    text is None when the page went over MAX_CONTENT_SIZE."""
+    target = _PageTarget()
+    parser = etree.HTMLParser(target=target, recover=True)
+    total_bytes = 0
     try:
-        for tag in soup.find_all("a", href=True):
-            href = tag.get("href")
-            if not href or href.strip() in ['#', 'javascript:void(0)', 'javascript:;']:
-                continue
-            try:
-                absolute_url = urljoin(url, href)
-                clean_url, _ = urldefrag(absolute_url)
-                if clean_url and clean_url != url:
-                    links.add(clean_url)
-            except Exception:
-                continue
+        for chunk in chunks:
+            total_bytes += len(chunk)
+            if total_bytes > MAX_CONTENT_SIZE:
+                return None, None, total_bytes
+            parser.feed(chunk)
+        parser.close()
     except Exception:
         pass
+    # str.split() tokenizes on any whitespace in C, collapsing the
+    # fragment boundaries into single spaces
+    text = ' '.join(' '.join(target.text_parts).split())
+    return text, target.hrefs, total_bytes
+
+def extract_next_links(url, hrefs):
+    links = set()
+    for href in hrefs:
+        if not href or href.strip() in ['#', 'javascript:void(0)', 'javascript:;']:
+            continue
+        try:
+            absolute_url = urljoin(url, href)
+            clean_url, _ = urldefrag(absolute_url)
+            if clean_url and clean_url != url:
+                links.add(clean_url)
+        except Exception:
+            continue
     return list(links)
 
-def save_page_data(url, words, text_content):
+def save_page_data(url, words, content_hash):
     try:
         url_hash = md5(url.encode('utf-8')).hexdigest()
         data = {
             'url': url,
             'word_count': len(words),
             'words': words[:1000],
-            'content_hash': hashlib.md5(text_content.encode('utf-8', errors='ignore')).hexdigest()
+            'content_hash': content_hash
         }
         with open(os.path.join(DATA_DIR, f"{url_hash}.json"), 'w') as f:
             json.dump(data, f)